@@ -0,0 +1,128 @@
+"""
+Latência por interação das páginas do dashboard sobre dados sintéticos da Olist.
+
+Gera o dataset Parquet com 'utils.synthetic_data' e o pipeline de preparação, aponta as páginas
+para ele ('TRIGGO_DATA_DIR') e mede com o AppTest do Streamlit o primeiro carregamento e os reruns
+disparados pelas interações (troca de filtros em 'Resultado das Vendas' e rerun em 'Desempenho das Vendas').
+
+Exemplo:
+    python benchmarks/dashboard_latency.py --scale 1 --interactions 10
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / "objetivos"))
+
+from utils import synthetic_data
+from utils import data_preparation as preparation
+from utils import data_storage as storage
+from utils import dashboard_data
+
+PAGES = {
+    'Resultado das Vendas': root_path / 'dashboard' / 'pages' / '📊 Resultado das Vendas.py',
+    'Desempenho das Vendas': root_path / 'dashboard' / 'pages' / '🚀 Desempenho das Vendas.py'
+}
+
+
+def build_dataset(data_dir: str, scale: float, seed: int) -> int:
+    dfs_dict = preparation.convert_dataframes_types(synthetic_data.generate_olist_dataframes(scale_factor= scale, seed= seed))
+
+    dfs_dict['order_reviews'] = dfs_dict['order_reviews'].drop_duplicates(subset= 'review_id', keep= 'first')
+    dfs_dict['geolocation'] = dfs_dict['geolocation'].drop_duplicates(subset= 'geolocation_zip_code_prefix', keep= 'first')
+    dfs_dict['orders'] = preparation.update_orders(dfs_dict['orders'], preparation.treat_delivered_anomalies(dfs_dict['orders']))
+
+    df, _ = preparation.merge_dataframes(dfs_dict)
+    dataset_path = os.path.join(data_dir, 'clean_general_dataset')
+    storage.save_partitioned_dataset(df, dataset_path)
+    # Arquivo compartilhado pelas sessões, gravado na preparação como no notebook 1
+    storage.export_arrow_ipc(dataset_path, columns= dashboard_data.DASHBOARD_COLS)
+
+    return df.shape[0]
+
+
+def interact(app, page: str, step: int, rng: np.random.Generator) -> None:
+    if page == 'Resultado das Vendas':
+        # Alterna entre seleções aleatórias de estados, mantendo todas as categorias
+        states = app.sidebar.multiselect[0]
+        options = list(states.options)
+        states.set_value(list(rng.choice(options, size= max(1, len(options) // 3), replace= False)))
+
+    app.run()
+
+    return None
+
+
+def measure_page(page: str, interactions: int, seed: int) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(PAGES[page]), default_timeout= 600)
+    rng = np.random.default_rng(seed)
+
+    start = time.perf_counter()
+    app.run()
+    first_load = time.perf_counter() - start
+
+    latencies = []
+    for step in range(interactions):
+        start = time.perf_counter()
+        interact(app, page, step, rng)
+        latencies.append(time.perf_counter() - start)
+
+    if app.exception:
+        raise RuntimeError(f'{page}: {app.exception[0].value}')
+
+    return {
+        'page': page,
+        'first_load_s': round(first_load, 4),
+        'interaction_mean_s': round(float(np.mean(latencies)), 4),
+        'interaction_median_s': round(float(np.median(latencies)), 4),
+        'interaction_max_s': round(float(np.max(latencies)), 4),
+        'interactions': interactions
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description= 'Latência por interação das páginas do dashboard.')
+    parser.add_argument('--scale', type= float, default= 1, help= 'Fator de escala dos dados sintéticos (1 = ~100 mil pedidos).')
+    parser.add_argument('--interactions', type= int, default= 10, help= 'Quantidade de interações medidas por página.')
+    parser.add_argument('--seed', type= int, default= 33, help= 'Semente dos dados sintéticos e das interações.')
+    parser.add_argument('--output', default= None, help= 'Arquivo JSON de resultados.')
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        n_rows = build_dataset(data_dir, args.scale, args.seed)
+        os.environ['TRIGGO_DATA_DIR'] = data_dir
+
+        results = []
+        for page in PAGES:
+            result = measure_page(page, args.interactions, args.seed)
+            results.append(result)
+            print(f"{page}: primeiro carregamento {result['first_load_s']:.3f}s | "
+                  f"interação média {result['interaction_mean_s']:.3f}s | mediana {result['interaction_median_s']:.3f}s")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents= True, exist_ok= True)
+        with open(args.output, 'w', encoding= 'utf-8') as file:
+            metadata = {'created_at': datetime.now().isoformat(timespec= 'seconds'), 'scale': args.scale,
+                        'rows': n_rows, 'seed': args.seed}
+            json.dump({'metadata': metadata, 'results': results}, file, indent= 2, ensure_ascii= False)
+
+    return None
+
+
+if __name__ == '__main__':
+    main()
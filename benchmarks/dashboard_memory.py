@@ -0,0 +1,233 @@
+"""
+Teste de carga de memória do dashboard: inicia um servidor do Streamlit sobre dados sintéticos da Olist,
+abre sessões simultâneas pelo websocket (como navegadores conectados) e mede a memória residente do
+processo do servidor à medida que o número de sessões cresce.
+
+Cada sessão abre as páginas 'Resultado das Vendas' e 'Desempenho das Vendas' e altera o filtro de estados
+da primeira. As sessões permanecem conectadas até o fim de cada rodada.
+
+Exemplo:
+    python benchmarks/dashboard_memory.py --scale 1 --sessions 1 10 25 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import psutil
+from tornado.websocket import websocket_connect
+
+from dashboard_latency import build_dataset, root_path
+
+MAIN_SCRIPT = root_path / 'dashboard' / 'Página Inicial.py'
+
+PAGES = ['Resultado das Vendas', 'Desempenho das Vendas']
+
+
+class PeakMemory:
+    """
+    Amostra, em uma thread, a memória residente de um processo enquanto o bloco é executado.
+    """
+    def __init__(self, process: psutil.Process, interval: float = 0.02):
+        self.process = process
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target= self._sample, daemon= True)
+
+    def rss_mb(self) -> float:
+        return self.process.memory_info().rss / 2**20
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak_mb = max(self.peak_mb, self.rss_mb())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, self.rss_mb())
+
+
+def start_server(data_dir: str) -> subprocess.Popen:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    env = {**os.environ, 'TRIGGO_DATA_DIR': data_dir}
+    server = subprocess.Popen([sys.executable, '-m', 'streamlit', 'run', str(MAIN_SCRIPT), '--server.headless', 'true',
+                               '--server.port', str(port), '--server.address', '127.0.0.1', '--browser.gatherUsageStats', 'false'],
+                              env= env, stdout= subprocess.DEVNULL, stderr= subprocess.DEVNULL)
+    server.port = port
+
+    for _ in range(300):
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout= 1)
+            return server
+        except OSError:
+            time.sleep(0.1)
+
+    server.kill()
+    raise RuntimeError('O servidor do Streamlit não iniciou.')
+
+
+async def rerun(connection, client_state) -> dict:
+    """
+    Executa a página da sessão e coleta as páginas do app, os multiselects exibidos e as exceções.
+    """
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    await connection.write_message(BackMsg(rerun_script= client_state).SerializeToString(), binary= True)
+
+    result = {'pages': {}, 'multiselects': [], 'exceptions': []}
+    while True:
+        message = await connection.read_message()
+        if message is None:
+            raise RuntimeError('Conexão encerrada pelo servidor.')
+
+        msg = ForwardMsg.FromString(message)
+        msg_type = msg.WhichOneof('type')
+
+        if msg_type in ('new_session', 'navigation'):
+            # As páginas do app são enviadas na mensagem 'navigation' (ou em 'new_session', em versões anteriores)
+            app_pages = getattr(msg, msg_type).app_pages
+            result['pages'].update({page.page_name: page.page_script_hash for page in app_pages if page.page_name})
+        elif msg_type == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+            element = msg.delta.new_element
+            if element.WhichOneof('type') == 'multiselect':
+                result['multiselects'].append(element.multiselect)
+            elif element.WhichOneof('type') == 'exception':
+                result['exceptions'].append(element.exception.message)
+        elif msg_type == 'script_finished':
+            return result
+
+
+def page_state(pages: dict, page: str, widget_states= None):
+    from streamlit.proto.ClientState_pb2 import ClientState
+
+    client_state = ClientState(page_script_hash= pages[page])
+    if widget_states is not None:
+        client_state.widget_states.widgets.extend(widget_states)
+
+    return client_state
+
+
+def states_filter(multiselect, rng: np.random.Generator):
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    options = list(multiselect.options)
+    selected = sorted(rng.choice(len(options), size= max(1, len(options) // 3), replace= False))
+
+    state = WidgetState(id= multiselect.id)
+    # Versões recentes do Streamlit identificam as opções pelo texto; as anteriores, pelo índice
+    if 'raw_values' in type(multiselect).DESCRIPTOR.fields_by_name:
+        state.string_array_value.data.extend([options[index] for index in selected])
+    else:
+        state.int_array_value.data.extend([int(index) for index in selected])
+
+    return state
+
+
+async def open_session(port: int, seed: int):
+    from streamlit.proto.ClientState_pb2 import ClientState
+
+    rng = np.random.default_rng(seed)
+    connection = await websocket_connect(f'ws://127.0.0.1:{port}/_stcore/stream', max_message_size= 2**30)
+
+    pages = (await rerun(connection, ClientState()))['pages']
+    exceptions = []
+    for page in PAGES:
+        result = await rerun(connection, page_state(pages, page))
+        exceptions += result['exceptions']
+
+        if result['multiselects']:
+            widget = states_filter(result['multiselects'][0], rng)
+            exceptions += (await rerun(connection, page_state(pages, page, [widget])))['exceptions']
+
+    if exceptions:
+        raise RuntimeError(exceptions[0])
+
+    return connection
+
+
+async def load_round(port: int, n_sessions: int, seed: int) -> None:
+    connections = await asyncio.gather(*[open_session(port, seed + index) for index in range(n_sessions)])
+
+    # Sessões conectadas ao mesmo tempo antes de serem encerradas
+    await asyncio.sleep(0.5)
+    for connection in connections:
+        connection.close()
+
+    return None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description= 'Memória do servidor do dashboard com sessões simultâneas.')
+    parser.add_argument('--scale', type= float, default= 1, help= 'Fator de escala dos dados sintéticos (1 = ~100 mil pedidos).')
+    parser.add_argument('--sessions', type= int, nargs= '+', default= [1, 10, 25, 50], help= 'Quantidades de sessões simultâneas medidas.')
+    parser.add_argument('--seed', type= int, default= 33, help= 'Semente dos dados sintéticos e dos filtros.')
+    parser.add_argument('--output', default= None, help= 'Arquivo JSON de resultados.')
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        n_rows = build_dataset(data_dir, args.scale, args.seed)
+        server = start_server(data_dir)
+
+        try:
+            process = psutil.Process(server.pid)
+
+            # Aquecimento: a primeira sessão carrega os dados e os caches do processo
+            asyncio.run(load_round(server.port, 1, args.seed))
+            baseline_mb = PeakMemory(process).rss_mb()
+            print(f"Servidor após a primeira sessão: {baseline_mb:.1f} MB")
+
+            results = []
+            for n_sessions in sorted(args.sessions):
+                with PeakMemory(process) as peak:
+                    asyncio.run(load_round(server.port, n_sessions, args.seed))
+
+                result = {'sessions': n_sessions, 'peak_rss_mb': round(peak.peak_mb, 1),
+                          'peak_delta_mb': round(peak.peak_mb - baseline_mb, 1)}
+                results.append(result)
+                print(f"{n_sessions:>4} sessões simultâneas: pico {result['peak_rss_mb']} MB (+{result['peak_delta_mb']} MB)")
+        finally:
+            server.terminate()
+            server.wait()
+
+        # Crescimento marginal do pico por sessão simultânea adicional
+        if len(results) > 1:
+            growth = (results[-1]['peak_rss_mb'] - results[0]['peak_rss_mb']) / (results[-1]['sessions'] - results[0]['sessions'])
+            print(f"Crescimento do pico por sessão adicional: {growth:.2f} MB")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents= True, exist_ok= True)
+        with open(args.output, 'w', encoding= 'utf-8') as file:
+            metadata = {'created_at': datetime.now().isoformat(timespec= 'seconds'), 'scale': args.scale,
+                        'rows': n_rows, 'baseline_rss_mb': round(baseline_mb, 1)}
+            json.dump({'metadata': metadata, 'results': results}, file, indent= 2, ensure_ascii= False)
+
+    return None
+
+
+if __name__ == '__main__':
+    main()
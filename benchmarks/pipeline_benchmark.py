@@ -0,0 +1,274 @@
+"""
+Benchmark das etapas do pipeline e do dashboard sobre dados sintéticos da Olist.
+
+Para cada fator de escala, gera as tabelas com 'utils.synthetic_data' e mede o tempo de parede,
+o tempo de CPU e o pico de memória (tracemalloc) de cada etapa. Os resultados são gravados em JSON
+para comparação entre execuções ('--baseline').
+
+Exemplo:
+    python benchmarks/pipeline_benchmark.py --scales 1 10 100 --output benchmarks/results/atual.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / "objetivos"))
+
+from utils import synthetic_data
+from utils import data_preparation as preparation
+from utils import customer_segmentation as segmentation
+from utils import customer_clustering as clustering
+from utils import dashboard_data
+from utils import review_text
+
+STAGES = ['generation', 'ingestion', 'anomaly_repair', 'merges', 'rfm', 'customer_clustering', 'dashboard_sales',
+          'dashboard_sellers', 'review_text_index', 'review_text_search', 'delay_model_training', 'delay_model_scoring']
+
+
+def stage_generation(state: dict, args) -> int:
+    state['raw'] = synthetic_data.generate_olist_dataframes(scale_factor= state['scale'], seed= args.seed)
+
+    return sum(df.shape[0] for df in state['raw'].values())
+
+
+def stage_ingestion(state: dict, args) -> int:
+    dfs_dict = {}
+    for file_name in os.listdir(state['csv_folder']):
+        df = pd.read_csv(os.path.join(state['csv_folder'], file_name))
+        dfs_dict[preparation.clean_file_name(file_name)] = df
+
+    dfs_dict = preparation.convert_dataframes_types(dfs_dict)
+
+    dfs_dict['order_reviews'] = dfs_dict['order_reviews'].drop_duplicates(subset= 'review_id', keep= 'first')
+    dfs_dict['geolocation'] = dfs_dict['geolocation'].drop_duplicates(subset= 'geolocation_zip_code_prefix', keep= 'first')
+
+    state['dfs_dict'] = dfs_dict
+
+    return sum(df.shape[0] for df in dfs_dict.values())
+
+
+def stage_anomaly_repair(state: dict, args) -> int:
+    orders = state['dfs_dict']['orders']
+    treated_orders = preparation.treat_delivered_anomalies(orders= orders)
+    state['orders'] = preparation.update_orders(orders, treated_orders)
+
+    return treated_orders.shape[0]
+
+
+def stage_merges(state: dict, args) -> int:
+    dfs_dict = dict(state['dfs_dict'], orders= state['orders'])
+    state['general_df'], state['delay_prediction_df'] = preparation.merge_dataframes(dfs_dict)
+
+    return state['general_df'].shape[0]
+
+
+def stage_rfm(state: dict, args) -> int:
+    df = segmentation.prepare_customers_orders(state['general_df'])
+    rfm = segmentation.segment_customers(segmentation.calculate_rfm(df))
+
+    return rfm.shape[0]
+
+
+def stage_customer_clustering(state: dict, args) -> int:
+    features = clustering.calculate_customer_features(state['general_df'])
+    chunks = lambda: clustering.iter_chunks(features, chunk_size= 50_000)
+
+    sample = clustering.sample_customers(chunks(), sample_size= 20_000)
+    n_clusters, _ = clustering.choose_n_clusters(sample, k_values= range(2, 11))
+    model = clustering.CustomerClustering(n_clusters= n_clusters).fit(chunks)
+    assigned = sum(chunk.shape[0] for chunk in model.assign(chunks()))
+
+    return assigned
+
+
+def stage_dashboard_sales(state: dict, args) -> int:
+    sales_df = dashboard_data.prepare_sales_df(state['general_df'])
+
+    # Seleção padrão da página: todos os estados e categorias
+    states = sales_df['customer_state'].dropna().unique()
+    categories = sales_df['product_category_name'].dropna().unique()
+    line_chart_df, map_df = dashboard_data.filter_sales(sales_df, states, categories)
+
+    sales_evolution = dashboard_data.aggregate_sales_evolution(line_chart_df)
+
+    return sales_evolution.shape[0]
+
+
+def stage_dashboard_sellers(state: dict, args) -> int:
+    reviews_df, sellers_df = dashboard_data.prepare_reviews_df(state['general_df'])
+    performance = dashboard_data.aggregate_sellers_performance(sellers_df)
+    dashboard_data.rank_sellers(performance)
+
+    return performance.shape[0]
+
+
+def stage_review_text_index(state: dict, args) -> int:
+    reviews = state['dfs_dict']['order_reviews']
+    state['text_index'] = review_text.ReviewTextIndex.build(reviews)
+
+    return reviews.shape[0]
+
+
+def stage_review_text_search(state: dict, args) -> int:
+    reviews = state['dfs_dict']['order_reviews']
+    one_star_ids = reviews.loc[reviews['review_score'] == 1, 'review_id']
+
+    return state['text_index'].search('atraso', review_ids= one_star_ids).shape[0]
+
+
+def stage_delay_model_training(state: dict, args) -> int:
+    from utils import delay_prediction as delay
+
+    df = delay.prepare_delay_prediction_df(state['delay_prediction_df'])
+    if args.train_sample is not None and df.shape[0] > args.train_sample:
+        df = df.sample(n= args.train_sample, random_state= args.seed)
+
+    X, y = delay.split_features_and_target(df)
+    state['X'] = X
+    state['model'] = delay.build_xgb_pipeline(n_jobs= args.n_jobs).fit(X, y)
+
+    return X.shape[0]
+
+
+def stage_delay_model_scoring(state: dict, args) -> int:
+    return state['model'].predict_proba(state['X'])[:, 1].shape[0]
+
+
+def run_stage(name: str, state: dict, args) -> dict:
+    stage = globals()[f'stage_{name}']
+
+    # Execução com tracemalloc apenas para o pico de memória (o rastreamento distorce os tempos)
+    tracemalloc.start()
+    stage(state, args)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    wall_times, cpu_times = [], []
+    for _ in range(args.repeat):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        n_rows = stage(state, args)
+        wall_times.append(time.perf_counter() - wall_start)
+        cpu_times.append(time.process_time() - cpu_start)
+
+    return {
+        'scale': state['scale'],
+        'stage': name,
+        'rows': int(n_rows),
+        'wall_time_s_mean': round(float(np.mean(wall_times)), 4),
+        'wall_time_s_min': round(float(np.min(wall_times)), 4),
+        'cpu_time_s_mean': round(float(np.mean(cpu_times)), 4),
+        'peak_memory_mb': round(peak_memory / 2**20, 2)
+    }
+
+
+def run_benchmarks(args) -> list:
+    results = []
+    for scale in args.scales:
+        state = {'scale': scale}
+
+        with tempfile.TemporaryDirectory() as csv_folder:
+            state['csv_folder'] = csv_folder
+
+            for name in STAGES:
+                # Etapas não selecionadas só rodam (sem medição) quando as seguintes dependem delas
+                later_selected = any(STAGES.index(selected) > STAGES.index(name) for selected in args.stages)
+                if name not in args.stages and not later_selected:
+                    continue
+
+                if name == 'ingestion':
+                    # Os CSVs de entrada são gravados fora da medição
+                    for key, df in state.pop('raw').items():
+                        df.to_csv(os.path.join(csv_folder, f'olist_{key}_dataset.csv'), index= False)
+
+                if name not in args.stages:
+                    globals()[f'stage_{name}'](state, args)
+                    continue
+
+                result = run_stage(name, state, args)
+                results.append(result)
+                print(f"[{scale}x] {name}: {result['wall_time_s_mean']:.3f}s | "
+                      f"CPU {result['cpu_time_s_mean']:.3f}s | pico {result['peak_memory_mb']:.1f} MB | {result['rows']} registros")
+
+    return results
+
+
+def collect_metadata(args) -> dict:
+    try:
+        git_commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd= root_path, capture_output= True, text= True).stdout.strip()
+    except OSError:
+        git_commit = None
+
+    return {
+        'created_at': datetime.now().isoformat(timespec= 'seconds'),
+        'git_commit': git_commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'train_sample': args.train_sample
+    }
+
+
+def compare_with_baseline(results: list, baseline_path: str, threshold: float) -> pd.DataFrame:
+    with open(baseline_path, encoding= 'utf-8') as file:
+        baseline = pd.DataFrame(json.load(file)['results'])
+
+    comparison = pd.DataFrame(results).merge(baseline, on= ['scale', 'stage'], how= 'inner', suffixes= ('', '_baseline'))
+    comparison['time_ratio'] = (comparison['wall_time_s_mean'] / comparison['wall_time_s_mean_baseline']).round(3)
+    comparison['memory_ratio'] = (comparison['peak_memory_mb'] / comparison['peak_memory_mb_baseline']).round(3)
+    comparison['regression'] = (comparison['time_ratio'] > threshold) | (comparison['memory_ratio'] > threshold)
+
+    return comparison[['scale', 'stage', 'wall_time_s_mean_baseline', 'wall_time_s_mean', 'time_ratio',
+                       'peak_memory_mb_baseline', 'peak_memory_mb', 'memory_ratio', 'regression']]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description= 'Benchmark do pipeline e do dashboard com dados sintéticos da Olist.')
+    parser.add_argument('--scales', type= float, nargs= '+', default= [1, 10, 100], help= 'Fatores de escala (1 = ~100 mil pedidos).')
+    parser.add_argument('--stages', nargs= '+', choices= STAGES, default= STAGES, help= 'Etapas medidas.')
+    parser.add_argument('--seed', type= int, default= 33, help= 'Semente do gerador de dados sintéticos.')
+    parser.add_argument('--repeat', type= int, default= 1, help= 'Quantidade de execuções cronometradas de cada etapa.')
+    parser.add_argument('--train-sample', type= int, default= None, help= 'Limite de registros no treinamento do modelo de atraso.')
+    parser.add_argument('--n-jobs', type= int, default= 8, help= 'Threads utilizadas pelo XGBoost.')
+    parser.add_argument('--output', default= None, help= 'Arquivo JSON de resultados (padrão: benchmarks/results/benchmark_<data>.json).')
+    parser.add_argument('--baseline', default= None, help= 'Arquivo JSON de uma execução anterior para comparação.')
+    parser.add_argument('--threshold', type= float, default= 1.2, help= 'Razão de tempo/memória considerada regressão.')
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    results = run_benchmarks(args)
+
+    output = args.output or root_path / 'benchmarks' / 'results' / f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"
+    Path(output).parent.mkdir(parents= True, exist_ok= True)
+    with open(output, 'w', encoding= 'utf-8') as file:
+        json.dump({'metadata': collect_metadata(args), 'results': results}, file, indent= 2, ensure_ascii= False)
+    print(f'Resultados gravados em {output}')
+
+    if args.baseline:
+        comparison = compare_with_baseline(results, args.baseline, args.threshold)
+        print(comparison.to_string(index= False))
+
+    return None
+
+
+if __name__ == '__main__':
+    main()
@@ -1,65 +1,99 @@
+from typing import List, Tuple
+import os
+import sys
 import streamlit as st
 import pandas as pd
 from pathlib import Path
 
-data_path = Path(__file__).resolve().parent.parent.parent / "data/clean_general_df.csv.gz"
+root_path = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(root_path / "objetivos"))
+
+from utils import data_storage as storage
+from utils import dashboard_data
+from utils import instrumentation as perf
+from utils import performance_panel
+
+data_path = Path(os.environ.get("TRIGGO_DATA_DIR", root_path / "data")) / "clean_general_dataset"
 
 # Título do dashboard
 st.title("Dashboard: Resultado das Vendas da Olist")
 
-# PREPARAÇÃO DOS DADOS
-df = pd.read_csv(data_path)
+# INSTRUMENTAÇÃO (habilitada pelo painel de performance)
+show_performance = performance_panel.performance_toggle()
+# A execução é finalizada mesmo quando o Streamlit interrompe a página (rerun ou sessão encerrada)
+with perf.run("Resultado das Vendas", enabled= show_performance) as current_run:
+    # PREPARAÇÃO DOS DADOS
+    # Os componentes são memorizados pela versão do dataset e pelos filtros: um rerun recalcula apenas
+    # os componentes cujas entradas mudaram
+    @st.cache_resource(show_spinner= False, max_entries= 1)
+    def load_sales_df(data_version: str) -> pd.DataFrame:
+        # Compartilhado entre as sessões e somente leitura: os componentes não alteram o DataFrame retornado
+        df = storage.load_shared_dataframe(data_path, columns= dashboard_data.SALES_COLS)
+
+        return dashboard_data.prepare_sales_df(df)
+
+
+    @st.cache_data(show_spinner= False)
+    def filter_options(data_version: str) -> Tuple[List[str], List[str]]:
+        with perf.cached_stage('load_sales_df'):
+            sales_df = load_sales_df(data_version)
+
+        customer_state = sorted(sales_df['customer_state'].dropna().unique())
+        categories = sorted(sales_df['product_category_name'].dropna().unique())
+
+        return customer_state, categories
+
 
-sales_df = df.loc[~df['order_status'].isin(['unavailable', 'canceled'])].copy()
+    # 'cache_resource' entrega o mesmo objeto a todas as sessões, sem a cópia feita pelo 'cache_data' a cada rerun
+    @st.cache_resource(show_spinner= False, max_entries= 32)
+    def sales_components(data_version: str, states: Tuple[str, ...], categories: Tuple[str, ...]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        with perf.cached_stage('load_sales_df'):
+            sales_df = load_sales_df(data_version)
 
-sales_df['order_delivered_customer_date'] = pd.to_datetime(sales_df['order_delivered_customer_date'], errors='coerce')
+        line_chart_df, map_df = dashboard_data.filter_sales(sales_df, list(states), list(categories))
 
-# Adiciona coluna de meses existentes do período
-sales_df['month_period'] = sales_df['order_delivered_customer_date'].dt.to_period('M').dt.to_timestamp()
+        return dashboard_data.aggregate_sales_evolution(line_chart_df), map_df
 
 
-# SIDEBAR COM FILTROS
-st.sidebar.header("Filtros")
+    data_version = storage.dataset_version(data_path)
 
-## Filtro por estado
-customer_state = sales_df['customer_state'].dropna().unique()
-customer_state_selected = st.sidebar.multiselect("Estado do Cliente", options=sorted(customer_state), default=list(customer_state))
 
-## Filtro por categoria
-categories = sales_df['product_category_name'].dropna().unique()
-category_selected = st.sidebar.multiselect("Categoria de Produto", options=sorted(categories), default=list(categories))
+    # SIDEBAR COM FILTROS
+    st.sidebar.header("Filtros")
 
+    # As etapas das funções memorizadas aparecem no painel como '<função> (cache)' quando o resultado vem do cache
+    with perf.cached_stage('filter_options'):
+        customer_state, categories = filter_options(data_version)
 
-# APLICAÇÃO DOS FILTROS
-line_chart_df = sales_df[['order_id', 'month_period', 'price']][
-    (sales_df['customer_state'].isin(customer_state_selected)) &
-    (sales_df['product_category_name'].isin(category_selected))
-].copy()
+    ## Filtro por estado
+    customer_state_selected = st.sidebar.multiselect("Estado do Cliente", options=customer_state, default=customer_state)
 
-map_df = sales_df[['customer_lat', 'customer_lng']].loc[
-    (sales_df['customer_state'].isin(customer_state_selected)) & 
-    (sales_df['product_category_name'].isin(category_selected))
-].copy()
+    ## Filtro por categoria
+    category_selected = st.sidebar.multiselect("Categoria de Produto", options=categories, default=categories)
 
-map_df.dropna(inplace= True)
 
+    # APLICAÇÃO DOS FILTROS E AGRUPAMENTO PARA GRÁFICO DE LINHA
+    # A ordem da seleção não altera o resultado, por isso os filtros são ordenados na chave do cache
+    with perf.cached_stage('sales_components'):
+        sales_evolution, map_df = sales_components(data_version, tuple(sorted(customer_state_selected)), tuple(sorted(category_selected)))
 
-# AGRUPAMENTO PARA GRÁFICO DE LINHA
-sales_evolution = (
-    line_chart_df.groupby('month_period').agg(n_orders= ('order_id', 'nunique'), monthly_billing= ('price', "sum")).reset_index()
-)
+    # APRESENTAÇÃO
+    ## GRÁFICO DE LINHA
+    st.subheader("📊 Evolução de Vendas por Mês")
 
-# APRESENTAÇÃO
-## GRÁFICO DE LINHA
-st.subheader("📊 Evolução de Vendas por Mês")
+    with perf.stage('figure: line_chart'):
+        st.line_chart(data= sales_evolution, x= 'month_period', y= 'n_orders', x_label= 'Meses do Período', y_label= 'Qnt. de Pedidos')
 
-st.line_chart(data= sales_evolution, x= 'month_period', y= 'n_orders', x_label= 'Meses do Período', y_label= 'Qnt. de Pedidos')
+    st.write(f"Total de pedidos: **{sales_evolution['n_orders'].sum()}**")
+    st.write(f"Total de faturamento: **R${round(sales_evolution['monthly_billing'].sum(), 2)}**")
 
-st.write(f"Total de pedidos: **{sales_evolution['n_orders'].sum()}**")
-st.write(f"Total de faturamento: **R${round(sales_evolution['monthly_billing'].sum(), 2)}**")
+    ## MAPA
+    st.subheader("🗺️ Mapa de Pedidos por Catagoria de Produto")
 
-## MAPA
-st.subheader("🗺️ Mapa de Pedidos por Catagoria de Produto")
+    with perf.stage('figure: map') as record:
+        record.rows_in = map_df.shape[0]
+        st.map(data= map_df, latitude= 'customer_lat', longitude= 'customer_lng')
 
-st.map(data= map_df, latitude= 'customer_lat', longitude= 'customer_lng')
+## PAINEL DE PERFORMANCE
+performance_panel.render_performance_panel(current_run)
 
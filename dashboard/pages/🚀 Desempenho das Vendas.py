@@ -1,116 +1,151 @@
+from typing import Dict
+import os
+import sys
 import streamlit as st
-import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 from pathlib import Path
 
-data_path = Path(__file__).resolve().parent.parent.parent / "data/clean_general_df.csv.gz"
+root_path = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(root_path / "objetivos"))
+
+from utils import data_storage as storage
+from utils import dashboard_data
+from utils import instrumentation as perf
+from utils import performance_panel
+
+data_path = Path(os.environ.get("TRIGGO_DATA_DIR", root_path / "data")) / "clean_general_dataset"
 
 # Título do dashboard
 st.title("Dashboard: Desempenho de Vendas da Olist")
 
-# PREPARAÇÃO DOS DADOS
-df = pd.read_csv(data_path)
-
-df['order_delivered_customer_date'] = pd.to_datetime(df['order_delivered_customer_date'], errors='coerce')
-df['order_purchase_timestamp'] = pd.to_datetime(df['order_purchase_timestamp'], errors='coerce')
-
-# Cálculo do tempo de entrega em dias
-df['delivery_time'] = (df['order_delivered_customer_date'] - df['order_purchase_timestamp']).dt.days
-
-# Limpeza: apenas pedidos com avaliação e entrega concluída
-reviews_df = df.dropna(subset=['review_score', 'delivery_time'])
-sellers_df = df.dropna(subset=['seller_id', 'review_score', 'delivery_time'])
-
-# AGRUPAMENTO PARA GRÁFICO
-performance = (
-    sellers_df.groupby('seller_id')
-    .agg(
-        total_sales=('order_id', 'nunique'),
-        mean_score=('review_score', 'mean'),
-        delivery_mean_time=('delivery_time', 'mean')
-    )
-    .reset_index()
-)
-
-top_sales = performance.sort_values(by='total_sales', ascending=False).head(10)
-avaliados = performance[performance['total_sales'] >= 30].sort_values(by='mean_score', ascending=False).head(10)
-rapidos = performance[performance['total_sales'] >= 30].sort_values(by='delivery_mean_time').head(10)
-
-# PERSONALIZAÇÕES
-personalized_color = {
-    1: "#d73027",  # vermelho
-    2: "#fc8d59",  # laranja claro
-    3: "#fee08b",  # amarelo
-    4: "#589ef2",  # verde claro
-    5: "#1a9850",  # verde escuro
-}
-
-# APRESENTAÇÃO
-# Relação entre Avaliação e Tempo de Entrega
-st.header("📈 Avaliação vs Tempo de Entrega")
-
-st.subheader("Dispersão: Avaliação x Tempo de Entrega")
-hist = px.histogram(
-    reviews_df, x="delivery_time", color="review_score",
-    nbins=100, barmode="overlay", opacity=0.6,
-    color_discrete_map= personalized_color,
-    labels={"delivery_time": "Tempo de Entrega (dias)", "review_score": "Nota de Avaliação"}
-)
-hist.update_layout(legend_title_text="Nota", bargap=0.1)
-st.plotly_chart(hist)
-
-
-st.subheader("Boxplot: Tempo de Entrega por Nota")
-box = px.box(reviews_df, x='review_score', y='delivery_time',
-             color= 'review_score',
-             color_discrete_map= personalized_color,
-             labels={'review_score': 'Nota de Avaliação', 'delivery_time': 'Tempo de Entrega (dias)'})
-st.plotly_chart(box)
-
-# Dashboard de Desempenho dos Vendedores
-st.header("🧑‍💼 Desempenho dos Vendedores")
-
-# Ranking dos 10 melhores por volume de vendas
-st.subheader("🏆 Top 10 Vendedores por Volume de Vendas")
-fig1 = px.bar(
-    top_sales,
-    x='seller_id',
-    y='total_sales',
-    title='Volume de Vendas por Vendedor',
-    labels={'seller_id': 'Vendedor', 'total_sales': 'Total de Vendas'},
-    color= 'total_sales',
-    color_continuous_scale= px.colors.sequential.Greens,
-    text_auto=True
-)
-fig1.update_layout(xaxis_tickangle=-45)
-st.plotly_chart(fig1, use_container_width=True)
-
-# Ranking por avaliação média (com mínimo de 30 pedidos)
-st.subheader("🌟 Top Vendedores por Avaliação (mínimo 30 pedidos)")
-fig2 = px.bar(
-    avaliados,
-    x='seller_id',
-    y='mean_score',
-    title='Avaliação Média por Vendedor',
-    labels={'seller_id': 'Vendedor', 'mean_score': 'Nota Média'},
-    text_auto=".2f",
-    color='mean_score',
-    color_continuous_scale= px.colors.sequential.Greens
-)
-fig2.update_layout(xaxis_tickangle=-45)
-st.plotly_chart(fig2, use_container_width=True)
-
-# Ranking por entrega mais rápida (mínimo de 30 pedidos)
-st.subheader("⚡ Vendedores com Entrega Mais Rápida (mínimo 30 pedidos)")
-fig3 = px.bar(
-    rapidos,
-    x='seller_id',
-    y='delivery_mean_time',
-    title='Tempo Médio de Entrega por Vendedor',
-    labels={'seller_id': 'Vendedor', 'delivery_mean_time': 'Entrega Média (dias)'},
-    text_auto=".2f",
-    color='delivery_mean_time',
-    color_continuous_scale=px.colors.sequential.Greens_r
-)
-fig3.update_layout(xaxis_tickangle=-45)
-st.plotly_chart(fig3, use_container_width=True)
\ No newline at end of file
+# INSTRUMENTAÇÃO (habilitada pelo painel de performance)
+show_performance = performance_panel.performance_toggle()
+# A execução é finalizada mesmo quando o Streamlit interrompe a página (rerun ou sessão encerrada)
+with perf.run("Desempenho das Vendas", enabled= show_performance) as current_run:
+    # PERSONALIZAÇÕES
+    personalized_color = {
+        1: "#d73027",  # vermelho
+        2: "#fc8d59",  # laranja claro
+        3: "#fee08b",  # amarelo
+        4: "#589ef2",  # verde claro
+        5: "#1a9850",  # verde escuro
+    }
+
+
+    # PREPARAÇÃO DOS DADOS E GRÁFICOS
+    # A página não tem filtros: os gráficos são construídos uma única vez por versão do dataset e
+    # compartilhados entre as sessões, e os reruns apenas os reexibem
+    @st.cache_resource(show_spinner= False, max_entries= 1)
+    def build_figures(data_version: str) -> Dict[str, go.Figure]:
+        df = storage.load_shared_dataframe(data_path, columns= dashboard_data.SELLERS_COLS)
+
+        reviews_df, sellers_df = dashboard_data.prepare_reviews_df(df)
+
+        # AGRUPAMENTO PARA GRÁFICO
+        delivery_distribution = dashboard_data.aggregate_delivery_time_distribution(reviews_df)
+
+        performance = dashboard_data.aggregate_sellers_performance(sellers_df)
+
+        top_sales, avaliados, rapidos = dashboard_data.rank_sellers(performance)
+
+        figures = {}
+
+        with perf.stage('build: histogram'):
+            hist = px.histogram(
+                delivery_distribution, x="delivery_time", y="n_reviews", histfunc="sum", color="review_score",
+                nbins=100, barmode="overlay", opacity=0.6,
+                color_discrete_map= personalized_color,
+                labels={"delivery_time": "Tempo de Entrega (dias)", "review_score": "Nota de Avaliação", "n_reviews": "Qnt. de Avaliações"}
+            )
+            hist.update_layout(legend_title_text="Nota", bargap=0.1, yaxis_title="Qnt. de Avaliações")
+            figures['histogram'] = hist
+
+        with perf.stage('build: boxplot'):
+            figures['boxplot'] = px.box(reviews_df, x='review_score', y='delivery_time',
+                                        color= 'review_score',
+                                        color_discrete_map= personalized_color,
+                                        labels={'review_score': 'Nota de Avaliação', 'delivery_time': 'Tempo de Entrega (dias)'})
+
+        # Ranking dos 10 melhores por volume de vendas
+        with perf.stage('build: top_sales'):
+            fig1 = px.bar(
+                top_sales,
+                x='seller_id',
+                y='total_sales',
+                title='Volume de Vendas por Vendedor',
+                labels={'seller_id': 'Vendedor', 'total_sales': 'Total de Vendas'},
+                color= 'total_sales',
+                color_continuous_scale= px.colors.sequential.Greens,
+                text_auto=True
+            )
+            fig1.update_layout(xaxis_tickangle=-45)
+            figures['top_sales'] = fig1
+
+        # Ranking por avaliação média (com mínimo de 30 pedidos)
+        with perf.stage('build: top_scores'):
+            fig2 = px.bar(
+                avaliados,
+                x='seller_id',
+                y='mean_score',
+                title='Avaliação Média por Vendedor',
+                labels={'seller_id': 'Vendedor', 'mean_score': 'Nota Média'},
+                text_auto=".2f",
+                color='mean_score',
+                color_continuous_scale= px.colors.sequential.Greens
+            )
+            fig2.update_layout(xaxis_tickangle=-45)
+            figures['top_scores'] = fig2
+
+        # Ranking por entrega mais rápida (mínimo de 30 pedidos)
+        with perf.stage('build: fastest_delivery'):
+            fig3 = px.bar(
+                rapidos,
+                x='seller_id',
+                y='delivery_mean_time',
+                title='Tempo Médio de Entrega por Vendedor',
+                labels={'seller_id': 'Vendedor', 'delivery_mean_time': 'Entrega Média (dias)'},
+                text_auto=".2f",
+                color='delivery_mean_time',
+                color_continuous_scale=px.colors.sequential.Greens_r
+            )
+            fig3.update_layout(xaxis_tickangle=-45)
+            figures['fastest_delivery'] = fig3
+
+        return figures
+
+
+    # Quando os gráficos vêm do cache, a etapa aparece no painel como 'build_figures (cache)'
+    with perf.cached_stage('build_figures'):
+        figures = build_figures(storage.dataset_version(data_path))
+
+    # APRESENTAÇÃO
+    # Relação entre Avaliação e Tempo de Entrega
+    st.header("📈 Avaliação vs Tempo de Entrega")
+
+    st.subheader("Dispersão: Avaliação x Tempo de Entrega")
+    with perf.stage('figure: histogram'):
+        st.plotly_chart(figures['histogram'])
+
+
+    st.subheader("Boxplot: Tempo de Entrega por Nota")
+    with perf.stage('figure: boxplot'):
+        st.plotly_chart(figures['boxplot'])
+
+    # Dashboard de Desempenho dos Vendedores
+    st.header("🧑‍💼 Desempenho dos Vendedores")
+
+    st.subheader("🏆 Top 10 Vendedores por Volume de Vendas")
+    with perf.stage('figure: top_sales'):
+        st.plotly_chart(figures['top_sales'], use_container_width=True)
+
+    st.subheader("🌟 Top Vendedores por Avaliação (mínimo 30 pedidos)")
+    with perf.stage('figure: top_scores'):
+        st.plotly_chart(figures['top_scores'], use_container_width=True)
+
+    st.subheader("⚡ Vendedores com Entrega Mais Rápida (mínimo 30 pedidos)")
+    with perf.stage('figure: fastest_delivery'):
+        st.plotly_chart(figures['fastest_delivery'], use_container_width=True)
+
+## PAINEL DE PERFORMANCE
+performance_panel.render_performance_panel(current_run)
@@ -0,0 +1,458 @@
+from typing import Callable, Iterable, Iterator, Tuple, Union
+from pathlib import Path
+import json
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from joblib import Parallel, delayed
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+from .data_storage import PARTITIONING
+from .instrumentation import profiled
+
+# Variáveis RFM e de comportamento de compra de cada cliente
+FEATURES = ['recency', 'frequency', 'monetary', 'avg_ticket', 'avg_items', 'avg_installments',
+            'avg_freight_ratio', 'avg_review_score']
+
+# Variáveis assimétricas: transformadas com log1p antes da padronização
+LOG_FEATURES = ['frequency', 'monetary', 'avg_ticket', 'avg_items', 'avg_installments']
+
+# Valores atribuídos a clientes sem a informação (ex.: pedidos sem avaliação)
+FEATURES_FILL = {'avg_items': 1.0, 'avg_installments': 1.0, 'avg_freight_ratio': 0.0, 'avg_review_score': 3.0}
+
+ORDER_COLS = ['customer_unique_id', 'order_id', 'order_status', 'order_purchase_timestamp', 'order_item_id', 'price',
+              'freight_value', 'payment_sequential', 'payment_value', 'payment_installments', 'review_id', 'review_score']
+
+HEX_DIGITS = '0123456789abcdef'
+
+
+@profiled()
+def calculate_customer_features(df: pd.DataFrame, reference_date: pd.Timestamp = None) -> pd.DataFrame:
+    """
+    Calcula as variáveis RFM e de comportamento de compra de cada cliente ('customer_unique_id').
+
+    As linhas do DataFrame geral são repetidas por item, pagamento e avaliação, por isso cada medida
+    é agregada por pedido a partir das linhas distintas da sua tabela de origem.
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame
+        DataFrame geral (ou um bloco dele contendo todos os pedidos dos seus clientes), com as variáveis de 'ORDER_COLS'.
+
+    reference_date : pd.Timestamp
+        Data de referência da recência. Se None, utiliza a última compra do DataFrame.
+
+    Retorno:
+    --------
+    pd.DataFrame
+        DataFrame com uma linha por cliente e as variáveis de 'FEATURES'.
+    """
+    df = df.loc[(df['order_status'] != 'canceled') & df['order_purchase_timestamp'].notna()]
+    df = df.assign(customer_unique_id= df['customer_unique_id'].astype(object), order_id= df['order_id'].astype(object))
+
+    if reference_date is None:
+        reference_date = df['order_purchase_timestamp'].max()
+
+    orders = df.groupby('order_id').agg(customer_unique_id= ('customer_unique_id', 'first'),
+                                        purchase_date= ('order_purchase_timestamp', 'max'))
+
+    items = df.drop_duplicates(subset= ['order_id', 'order_item_id']).dropna(subset= ['order_item_id'])
+    items = items.groupby('order_id').agg(n_items= ('order_item_id', 'size'), price= ('price', 'sum'), freight= ('freight_value', 'sum'))
+
+    payments = df.drop_duplicates(subset= ['order_id', 'payment_sequential']).dropna(subset= ['payment_value'])
+    payments = payments.groupby('order_id').agg(payment_value= ('payment_value', 'sum'), installments= ('payment_installments', 'max'))
+
+    reviews = df.drop_duplicates(subset= ['order_id', 'review_id']).groupby('order_id').agg(review_score= ('review_score', 'mean'))
+
+    orders = orders.join([items, payments, reviews])
+
+    customers = orders.groupby('customer_unique_id').agg(
+        last_purchase= ('purchase_date', 'max'),
+        frequency= ('purchase_date', 'size'),
+        monetary= ('payment_value', 'sum'),
+        avg_items= ('n_items', 'mean'),
+        avg_installments= ('installments', 'mean'),
+        price= ('price', 'sum'),
+        freight= ('freight', 'sum'),
+        avg_review_score= ('review_score', 'mean')
+    )
+
+    customers['recency'] = (reference_date - customers['last_purchase']).dt.days
+    customers['avg_ticket'] = customers['monetary'] / customers['frequency']
+    customers['avg_freight_ratio'] = customers['freight'] / customers['price'].where(customers['price'] > 0)
+
+    customers = customers.fillna(FEATURES_FILL)
+
+    return customers[FEATURES].reset_index()
+
+
+def latest_purchase_date(dataset_path: Union[str, Path]) -> pd.Timestamp:
+    """
+    Data da última compra do dataset particionado, lida em lotes (memória limitada).
+    """
+    dataset = ds.dataset(dataset_path, format= 'parquet', partitioning= PARTITIONING)
+
+    latest = None
+    for batch in dataset.to_batches(columns= ['order_purchase_timestamp']):
+        batch_max = pc.max(batch.column(0)).as_py()
+        if batch_max is not None and (latest is None or batch_max > latest):
+            latest = batch_max
+
+    return pd.Timestamp(latest)
+
+
+def customer_feature_chunks(dataset_path: Union[str, Path], prefix_length: int = 1,
+                            reference_date: pd.Timestamp = None, staging_path: Union[str, Path] = None) -> Iterator[pd.DataFrame]:
+    """
+    Calcula as variáveis dos clientes em blocos, agrupados pelo prefixo do 'customer_unique_id' (hexadecimal).
+    O dataset particionado é lido uma única vez, em lotes, e os pedidos são gravados em um diretório
+    temporário particionado pelo prefixo; cada bloco é então lido da sua partição. Cada cliente pertence
+    a um único bloco, e a memória utilizada é limitada pelo tamanho do bloco.
+
+    Parâmetros:
+    -----------
+    dataset_path : str | Path
+        Diretório do dataset gravado por 'data_storage.save_partitioned_dataset'.
+
+    prefix_length : int
+        Tamanho do prefixo: os clientes são divididos em 16 ** prefix_length blocos.
+
+    reference_date : pd.Timestamp
+        Data de referência da recência. Se None, utiliza a última compra do dataset.
+
+    staging_path : str | Path
+        Diretório onde é criado o diretório temporário dos pedidos. Se None, utiliza o diretório temporário do sistema.
+
+    Retorno:
+    --------
+    Iterator[pd.DataFrame]
+        Blocos de clientes com as variáveis de 'FEATURES'.
+    """
+    if reference_date is None:
+        reference_date = latest_purchase_date(dataset_path)
+
+    dataset = ds.dataset(dataset_path, format= 'parquet', partitioning= PARTITIONING)
+    columns = [col for col in ORDER_COLS if col in dataset.schema.names]
+
+    prefixes = ['']
+    for _ in range(prefix_length):
+        prefixes = [prefix + digit for prefix in prefixes for digit in HEX_DIGITS]
+
+    # Uma única leitura do dataset: os lotes são distribuídos pelas partições do prefixo
+    customer_id = pc.field('customer_unique_id').cast(pa.string())
+    projection = {col: pc.field(col) for col in columns}
+    projection['customer_prefix'] = pc.utf8_slice_codeunits(customer_id, 0, prefix_length)
+    scanner = dataset.scanner(columns= projection, filter= pc.field('customer_unique_id').is_valid())
+
+    with tempfile.TemporaryDirectory(dir= staging_path) as orders_path:
+        ds.write_dataset(scanner, orders_path, format= 'parquet', partitioning= ['customer_prefix'],
+                         partitioning_flavor= 'hive', basename_template= 'part-{i}.parquet')
+
+        for prefix in prefixes:
+            prefix_path = Path(orders_path) / f'customer_prefix={prefix}'
+            if not prefix_path.exists():
+                continue
+
+            table = ds.dataset(prefix_path, format= 'parquet').to_table(columns= columns)
+            if table.num_rows > 0:
+                yield calculate_customer_features(table.to_pandas(), reference_date)
+
+
+@profiled()
+def save_customer_features(dataset_path: Union[str, Path], features_path: Union[str, Path], prefix_length: int = 1,
+                           reference_date: pd.Timestamp = None) -> int:
+    """
+    Calcula as variáveis dos clientes bloco a bloco ('customer_feature_chunks') e as grava em um único
+    arquivo Parquet, com um row group por bloco. O dataset particionado é lido uma única vez e as
+    passagens do treinamento percorrem o arquivo de variáveis ('read_customer_features').
+
+    Parâmetros:
+    -----------
+    dataset_path : str | Path
+        Diretório do dataset gravado por 'data_storage.save_partitioned_dataset'.
+
+    features_path : str | Path
+        Arquivo Parquet das variáveis dos clientes (ex.: '../data/customer_clusters/features.parquet').
+
+    prefix_length : int
+        Tamanho do prefixo: os clientes são divididos em 16 ** prefix_length blocos.
+
+    reference_date : pd.Timestamp
+        Data de referência da recência. Se None, utiliza a última compra do dataset.
+
+    Retorno:
+    --------
+    int
+        Quantidade de clientes gravados.
+    """
+    features_path = Path(features_path)
+    features_path.parent.mkdir(parents= True, exist_ok= True)
+
+    n_customers = 0
+    writer = None
+    try:
+        for chunk in customer_feature_chunks(dataset_path, prefix_length, reference_date, staging_path= features_path.parent):
+            table = pa.Table.from_pandas(chunk, preserve_index= False)
+            if writer is None:
+                writer = pq.ParquetWriter(features_path, table.schema)
+            writer.write_table(table.cast(writer.schema), row_group_size= max(table.num_rows, 1))
+            n_customers += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return n_customers
+
+
+def read_customer_features(features_path: Union[str, Path]) -> Iterator[pd.DataFrame]:
+    """
+    Percorre os blocos de clientes gravados por 'save_customer_features', um row group por vez.
+    """
+    parquet_file = pq.ParquetFile(features_path)
+
+    for row_group in range(parquet_file.num_row_groups):
+        yield parquet_file.read_row_group(row_group).to_pandas()
+
+
+def iter_chunks(df: pd.DataFrame, chunk_size: int = 100_000) -> Iterator[pd.DataFrame]:
+    """
+    Divide um DataFrame em memória em blocos de 'chunk_size' linhas.
+    """
+    for start in range(0, df.shape[0], chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def sample_customers(chunks: Iterable[pd.DataFrame], sample_size: int = 20_000, random_state: int = 33) -> pd.DataFrame:
+    """
+    Amostra aleatória simples dos clientes de todos os blocos, mantendo em memória apenas a amostra: cada
+    cliente recebe uma chave aleatória e são mantidas as 'sample_size' menores chaves.
+    """
+    rng = np.random.default_rng(random_state)
+
+    sample = None
+    for chunk in chunks:
+        chunk = chunk.assign(_sample_key= rng.random(chunk.shape[0]))
+        sample = chunk if sample is None else pd.concat([sample, chunk], ignore_index= True)
+        sample = sample.nsmallest(sample_size, '_sample_key')
+
+    return sample.drop(columns= '_sample_key').reset_index(drop= True)
+
+
+def transform_features(features: pd.DataFrame) -> np.ndarray:
+    """
+    Matriz das variáveis de 'FEATURES', com log1p aplicado às variáveis assimétricas ('LOG_FEATURES'),
+    antes da padronização.
+    """
+    X = features[FEATURES].to_numpy(dtype= np.float64, copy= True)
+
+    log_cols = [FEATURES.index(col) for col in LOG_FEATURES]
+    X[:, log_cols] = np.log1p(np.clip(X[:, log_cols], 0, None))
+
+    return X
+
+
+def __evaluate_n_clusters(X: np.ndarray, n_clusters: int, batch_size: int, random_state: int) -> dict:
+    kmeans = MiniBatchKMeans(n_clusters= n_clusters, batch_size= batch_size, n_init= 3, random_state= random_state).fit(X)
+
+    return {
+        'n_clusters': n_clusters,
+        'inertia': kmeans.inertia_,
+        'silhouette': silhouette_score(X, kmeans.labels_, sample_size= min(X.shape[0], 10_000), random_state= random_state)
+    }
+
+
+@profiled()
+def choose_n_clusters(sample: pd.DataFrame, k_values: Iterable[int] = range(2, 11), batch_size: int = 4096,
+                      n_jobs: int = -1, random_state: int = 33) -> Tuple[int, pd.DataFrame]:
+    """
+    Avalia, em paralelo, a inércia e o coeficiente de silhueta de cada quantidade de clusters em uma amostra
+    de clientes (ver 'sample_customers') e escolhe a quantidade com o maior coeficiente de silhueta.
+
+    Parâmetros:
+    -----------
+    sample : pd.DataFrame
+        Amostra de clientes com as variáveis de 'FEATURES'.
+
+    k_values : Iterable[int]
+        Quantidades de clusters avaliadas.
+
+    batch_size : int
+        Tamanho dos lotes do MiniBatchKMeans.
+
+    n_jobs : int
+        Quantidade de processos (-1 = todos os núcleos).
+
+    random_state : int
+        Semente dos modelos e da amostra da silhueta.
+
+    Retorno:
+    --------
+    Tuple[int, pd.DataFrame]
+        A quantidade de clusters escolhida e o DataFrame com as variáveis 'n_clusters', 'inertia' e
+        'silhouette', ordenado por 'n_clusters'.
+    """
+    X = StandardScaler().fit_transform(transform_features(sample))
+
+    results = Parallel(n_jobs= n_jobs)(
+        delayed(__evaluate_n_clusters)(X, n_clusters, batch_size, random_state) for n_clusters in k_values
+    )
+
+    scores = pd.DataFrame(results).sort_values('n_clusters').reset_index(drop= True)
+
+    return int(scores.loc[scores['silhouette'].idxmax(), 'n_clusters']), scores
+
+
+class CustomerClustering:
+    """
+    Clusterização incremental dos clientes: padronização e MiniBatchKMeans treinados com 'partial_fit'
+    sobre blocos de clientes, sem carregar todos em memória.
+
+    Depois do treinamento, apenas os parâmetros da padronização, os centroides e os perfis dos clusters
+    são mantidos (e gravados com 'save'). Novos clientes são atribuídos em lote com 'predict', sem retreinar.
+    """
+    def __init__(self, n_clusters: int = 5, batch_size: int = 4096, random_state: int = 33):
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.random_state = random_state
+        self.scaler_mean = None
+        self.scaler_scale = None
+        self.centroids = None
+        self.profiles = None
+
+    @profiled('customer_clustering.fit')
+    def fit(self, chunks: Callable[[], Iterable[pd.DataFrame]], n_epochs: int = 3) -> 'CustomerClustering':
+        """
+        Treina o modelo percorrendo os blocos de clientes: uma passagem para a padronização, 'n_epochs'
+        passagens para o MiniBatchKMeans e uma passagem para os perfis dos clusters.
+
+        Parâmetros:
+        -----------
+        chunks : Callable[[], Iterable[pd.DataFrame]]
+            Função que retorna um novo iterador de blocos a cada passagem
+            (ex.: lambda: read_customer_features(features_path)).
+
+        n_epochs : int
+            Quantidade de passagens do MiniBatchKMeans sobre os blocos.
+
+        Retorno:
+        --------
+        CustomerClustering
+            O próprio modelo treinado.
+        """
+        scaler = StandardScaler()
+        for chunk in chunks():
+            scaler.partial_fit(transform_features(chunk))
+
+        self.scaler_mean, self.scaler_scale = scaler.mean_, scaler.scale_
+
+        kmeans = MiniBatchKMeans(n_clusters= self.n_clusters, batch_size= self.batch_size, random_state= self.random_state)
+        for _ in range(n_epochs):
+            for chunk in chunks():
+                X = self.__scale(chunk)
+                for start in range(0, X.shape[0], self.batch_size):
+                    batch = X[start:start + self.batch_size]
+                    # A inicialização dos centroides precisa de ao menos 'n_clusters' clientes no lote
+                    if batch.shape[0] >= self.n_clusters:
+                        kmeans.partial_fit(batch)
+
+        self.centroids = kmeans.cluster_centers_
+        self.profiles = self.profile(chunks())
+
+        return self
+
+    def __scale(self, features: pd.DataFrame) -> np.ndarray:
+        return (transform_features(features) - self.scaler_mean) / self.scaler_scale
+
+    def predict(self, features: pd.DataFrame) -> np.ndarray:
+        """
+        Atribui cada cliente ao centroide mais próximo (operação vetorizada sobre o bloco).
+        """
+        X = self.__scale(features)
+
+        # ||x - c||² = ||x||² - 2 x·c + ||c||² (o termo ||x||² não altera o centroide mais próximo)
+        distances = (self.centroids ** 2).sum(axis= 1) - 2 * X @ self.centroids.T
+
+        return distances.argmin(axis= 1)
+
+    def assign(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Atribui os clusters dos clientes de cada bloco.
+
+        Retorno:
+        --------
+        Iterator[pd.DataFrame]
+            Blocos com as variáveis 'customer_unique_id' e 'cluster'.
+        """
+        for chunk in chunks:
+            yield pd.DataFrame({'customer_unique_id': chunk['customer_unique_id'].to_numpy(), 'cluster': self.predict(chunk)})
+
+    def profile(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Perfil de cada cluster: quantidade e proporção de clientes e média de cada variável, acumulados
+        bloco a bloco.
+        """
+        sizes = np.zeros(self.n_clusters)
+        sums = np.zeros((self.n_clusters, len(FEATURES)))
+
+        for chunk in chunks:
+            labels = self.predict(chunk)
+            sizes += np.bincount(labels, minlength= self.n_clusters)
+            np.add.at(sums, labels, chunk[FEATURES].to_numpy(dtype= np.float64))
+
+        profiles = pd.DataFrame(sums / np.maximum(sizes, 1)[:, None], columns= FEATURES)
+        profiles.insert(0, 'customers', sizes.astype(int))
+        profiles.insert(1, 'share', sizes / max(sizes.sum(), 1))
+        profiles.index.name = 'cluster'
+
+        return profiles
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Grava os parâmetros do modelo ('model.json') e os perfis dos clusters ('profiles.parquet').
+        """
+        path = Path(path)
+        path.mkdir(parents= True, exist_ok= True)
+
+        model = {
+            'features': FEATURES,
+            'log_features': LOG_FEATURES,
+            'n_clusters': self.n_clusters,
+            'batch_size': self.batch_size,
+            'random_state': self.random_state,
+            'scaler_mean': self.scaler_mean.tolist(),
+            'scaler_scale': self.scaler_scale.tolist(),
+            'centroids': self.centroids.tolist()
+        }
+        with open(path / 'model.json', 'w', encoding= 'utf-8') as file:
+            json.dump(model, file, indent= 2)
+
+        self.profiles.to_parquet(path / 'profiles.parquet')
+
+        return None
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'CustomerClustering':
+        """
+        Carrega um modelo gravado por 'save', pronto para atribuir novos clientes.
+        """
+        path = Path(path)
+
+        with open(path / 'model.json', encoding= 'utf-8') as file:
+            model = json.load(file)
+
+        if model['features'] != FEATURES or model['log_features'] != LOG_FEATURES:
+            raise ValueError("O modelo gravado utiliza variáveis diferentes das atuais ('FEATURES').")
+
+        clustering = cls(model['n_clusters'], model['batch_size'], model['random_state'])
+        clustering.scaler_mean = np.array(model['scaler_mean'])
+        clustering.scaler_scale = np.array(model['scaler_scale'])
+        clustering.centroids = np.array(model['centroids'])
+        clustering.profiles = pd.read_parquet(path / 'profiles.parquet')
+
+        return clustering
@@ -0,0 +1,121 @@
+import pandas as pd
+
+SEGMENTS_MAP = {
+    (5, 5): 'Champions',
+    (5, 4): 'Loyal Customers',
+    (5, 3): 'Loyal Customers',
+    (5, 2): 'New Customers',
+    (5, 1): 'New Customers',
+    (4, 5): 'Potential Loyalist',
+    (4, 4): 'Potential Loyalist',
+    (4, 3): 'Potential Loyalist',
+    (4, 2): 'Promising',
+    (4, 1): 'Promising',
+    (3, 5): 'Loyal Customers',
+    (3, 4): 'Loyal Customers',
+    (3, 3): 'Need Attention',
+    (3, 2): 'About To Sleep',
+    (3, 1): 'About To Sleep',
+    (2, 5): "Can't Loose Them",
+    (2, 4): "Can't Loose Them",
+    (2, 3): "At Risk",
+    (2, 2): 'Hibernating',
+    (2, 1): 'Hibernating',
+    (1, 5): "Can't Loose Them",
+    (1, 4): "Can't Loose Them",
+    (1, 3): "At Risk",
+    (1, 2): 'Hibernating',
+    (1, 1): 'Lost'
+}
+
+
+def prepare_customers_orders(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mantém apenas os pedidos não cancelados com data de compra e valor de pagamento válidos.
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame
+        DataFrame geral com pedidos, clientes e pagamentos.
+
+    Retorno:
+    --------
+    pd.DataFrame
+        DataFrame filtrado.
+    """
+    # Converter colunas de data em datetime
+    df = df.assign(order_purchase_timestamp= pd.to_datetime(df['order_purchase_timestamp']))
+
+    # Pedidos entregues com data válida
+    df = df[df['order_status'] != 'canceled']
+    df = df.dropna(subset=['order_purchase_timestamp', 'payment_value'])
+
+    return df
+
+
+def calculate_rfm(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula a Recência, Frequência e Valor Monetário de cada cliente e atribui os scores RFM (1 = pior, 5 = melhor).
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame
+        DataFrame retornado por 'prepare_customers_orders'.
+
+    Retorno:
+    --------
+    pd.DataFrame
+        DataFrame com uma linha por cliente ('customer_unique_id') e os scores RFM.
+    """
+    # Data de referência calculada uma única vez: a recência é a diferença para a última compra de cada cliente
+    reference_date = df['order_purchase_timestamp'].max()
+
+    rfm = df.groupby('customer_unique_id', observed= True).agg({
+        'order_purchase_timestamp': 'max',
+        'order_id': 'nunique',
+        'payment_value': 'sum'
+    }).reset_index()
+
+    rfm.columns = ['customer_id', 'Recency', 'Frequency', 'Monetary']
+    rfm['Recency'] = (reference_date - rfm['Recency']).dt.days
+
+    # Atribuir scores RFM (1 = pior, 5 = melhor)
+    rfm['recency_score'] = pd.qcut(rfm['Recency'], q= 5, labels=[5, 4, 3, 2, 1]).astype(int)
+    rfm['frequency_score'] = pd.qcut(rfm['Frequency'].rank(method="first"), q= 5, labels=[1, 2, 3, 4, 5]).astype(int)
+    rfm['monetary_score'] = pd.qcut(rfm['Monetary'], q= 5, labels=[1, 2, 3, 4, 5]).astype(int)
+    rfm['freq_and_mon_score'] = ((rfm['frequency_score'] + rfm['monetary_score']) / 2).round().astype(int)
+
+    return rfm
+
+
+def segment_customers(rfm):
+    """
+    Segmenta clientes com base em uma matriz R x FM usando mapeamento direto.
+    """
+    def classify(row):
+        return SEGMENTS_MAP.get((row['recency_score'], row['freq_and_mon_score']))
+
+    rfm['segments'] = rfm.apply(classify, axis=1)
+    return rfm
+
+
+def calculate_retention_rate(df: pd.DataFrame) -> float:
+    """
+    Calcula a taxa de retenção (percentual de clientes com mais de um pedido).
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame
+        DataFrame retornado por 'prepare_customers_orders'.
+
+    Retorno:
+    --------
+    float
+        Taxa de retenção em percentual, com duas casas decimais.
+    """
+    customers_group = df.groupby('customer_unique_id', observed= True)['order_id'].nunique().reset_index()
+    returned_customers = customers_group[customers_group['order_id'] > 1]
+
+    returned_customers_rate = round((returned_customers.shape[0] / customers_group.shape[0]) * 100, 2)
+
+    return returned_customers_rate
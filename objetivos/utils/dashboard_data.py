@@ -0,0 +1,205 @@
+from typing import List, Tuple
+import pandas as pd
+
+from .instrumentation import profiled
+
+# Variáveis carregadas pelas páginas do dashboard, exportadas para o arquivo Arrow IPC compartilhado
+SALES_COLS = ['order_id', 'order_status', 'order_delivered_customer_date', 'customer_state', 'product_category_name',
+              'price', 'customer_lat', 'customer_lng']
+
+SELLERS_COLS = ['order_id', 'seller_id', 'review_score', 'order_purchase_timestamp', 'order_delivered_customer_date']
+
+DASHBOARD_COLS = list(dict.fromkeys(SALES_COLS + SELLERS_COLS))
+
+
+@profiled()
+def prepare_sales_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Prepara os dados da página 'Resultado das Vendas': remove pedidos indisponíveis ou cancelados
+    e adiciona o mês de entrega ('month_period'). O DataFrame de entrada não é alterado.
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame
+        DataFrame geral com as variáveis de pedidos, itens e clientes.
+
+    Retorno:
+    --------
+    pd.DataFrame
+        DataFrame de vendas.
+    """
+    sales_df = df.loc[~df['order_status'].isin(['unavailable', 'canceled'])]
+
+    delivered_date = pd.to_datetime(sales_df['order_delivered_customer_date'], errors='coerce')
+
+    # Adiciona coluna de meses existentes do período
+    sales_df = sales_df.assign(order_delivered_customer_date= delivered_date,
+                               month_period= delivered_date.dt.to_period('M').dt.to_timestamp())
+
+    return sales_df
+
+
+@profiled()
+def filter_sales(sales_df: pd.DataFrame, states: List[str], categories: List[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Aplica os filtros de estado do cliente e categoria de produto aos dados de vendas, selecionando
+    apenas os registros e as colunas de cada gráfico.
+
+    Parâmetros:
+    -----------
+    sales_df : pd.DataFrame
+        DataFrame retornado por 'prepare_sales_df'.
+
+    states : List[str]
+        Estados do cliente selecionados.
+
+    categories : List[str]
+        Categorias de produto selecionadas.
+
+    Retorno:
+    --------
+    Tuple[pd.DataFrame, pd.DataFrame]
+        Os dados do gráfico de linha e os dados do mapa (coordenadas distintas e sem valores faltantes).
+    """
+    mask = sales_df['customer_state'].isin(states) & sales_df['product_category_name'].isin(categories)
+
+    line_chart_df = sales_df.loc[mask, ['order_id', 'month_period', 'price']]
+
+    # Clientes do mesmo CEP compartilham as coordenadas: pontos repetidos seriam desenhados uns sobre os
+    # outros e apenas aumentariam os dados enviados ao navegador a cada rerun
+    map_df = sales_df.loc[mask, ['customer_lat', 'customer_lng']].dropna().drop_duplicates()
+
+    return line_chart_df, map_df
+
+
+@profiled()
+def aggregate_sales_evolution(line_chart_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega a quantidade de pedidos e o faturamento por mês.
+
+    Parâmetros:
+    -----------
+    line_chart_df : pd.DataFrame
+        Dados do gráfico de linha retornados por 'filter_sales'.
+
+    Retorno:
+    --------
+    pd.DataFrame
+        DataFrame com as variáveis 'month_period', 'n_orders' e 'monthly_billing'.
+    """
+    sales_evolution = (
+        line_chart_df.groupby('month_period').agg(n_orders= ('order_id', 'nunique'), monthly_billing= ('price', "sum")).reset_index()
+    )
+
+    return sales_evolution
+
+
+@profiled()
+def prepare_reviews_df(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Prepara os dados da página 'Desempenho das Vendas': calcula o tempo de entrega em dias e mantém
+    apenas pedidos com avaliação e entrega concluída.
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame
+        DataFrame geral com as variáveis de pedidos, vendedores e avaliações.
+
+    Retorno:
+    --------
+    Tuple[pd.DataFrame, pd.DataFrame]
+        Os dados de avaliações e os dados de vendedores.
+    """
+    df = df.assign(
+        order_delivered_customer_date= pd.to_datetime(df['order_delivered_customer_date'], errors='coerce'),
+        order_purchase_timestamp= pd.to_datetime(df['order_purchase_timestamp'], errors='coerce')
+    )
+
+    # Cálculo do tempo de entrega em dias
+    df['delivery_time'] = (df['order_delivered_customer_date'] - df['order_purchase_timestamp']).dt.days
+
+    # Limpeza: apenas pedidos com avaliação e entrega concluída
+    reviews_df = df.dropna(subset=['review_score', 'delivery_time'])
+    sellers_df = df.dropna(subset=['seller_id', 'review_score', 'delivery_time'])
+
+    return reviews_df, sellers_df
+
+
+@profiled()
+def aggregate_delivery_time_distribution(reviews_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Conta as avaliações por tempo de entrega e nota, para o histograma 'Avaliação x Tempo de Entrega'
+    ser desenhado a partir das contagens em vez de uma linha por avaliação.
+
+    Parâmetros:
+    -----------
+    reviews_df : pd.DataFrame
+        Dados de avaliações retornados por 'prepare_reviews_df'.
+
+    Retorno:
+    --------
+    pd.DataFrame
+        DataFrame com as variáveis 'delivery_time', 'review_score' e 'n_reviews'.
+    """
+    distribution = (
+        reviews_df.groupby(['delivery_time', 'review_score']).size().reset_index(name= 'n_reviews')
+    )
+
+    return distribution
+
+
+@profiled()
+def aggregate_sellers_performance(sellers_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega o total de vendas, a nota média e o tempo médio de entrega de cada vendedor.
+
+    Parâmetros:
+    -----------
+    sellers_df : pd.DataFrame
+        Dados de vendedores retornados por 'prepare_reviews_df'.
+
+    Retorno:
+    --------
+    pd.DataFrame
+        DataFrame com uma linha por vendedor.
+    """
+    performance = (
+        sellers_df.groupby('seller_id', observed= True)
+        .agg(
+            total_sales=('order_id', 'nunique'),
+            mean_score=('review_score', 'mean'),
+            delivery_mean_time=('delivery_time', 'mean')
+        )
+        .reset_index()
+        .astype({'seller_id': str})
+    )
+
+    return performance
+
+
+@profiled()
+def rank_sellers(performance: pd.DataFrame, min_sales: int = 30, top_n: int = 10) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Cria os rankings de vendedores por volume de vendas, avaliação média e entrega mais rápida.
+
+    Parâmetros:
+    -----------
+    performance : pd.DataFrame
+        DataFrame retornado por 'aggregate_sellers_performance'.
+
+    min_sales : int
+        Quantidade mínima de pedidos para os rankings de avaliação e de entrega.
+
+    top_n : int
+        Quantidade de vendedores em cada ranking.
+
+    Retorno:
+    --------
+    Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]
+        Os rankings por volume de vendas, por avaliação e por entrega mais rápida.
+    """
+    top_sales = performance.sort_values(by='total_sales', ascending=False).head(top_n)
+    avaliados = performance[performance['total_sales'] >= min_sales].sort_values(by='mean_score', ascending=False).head(top_n)
+    rapidos = performance[performance['total_sales'] >= min_sales].sort_values(by='delivery_mean_time').head(top_n)
+
+    return top_sales, avaliados, rapidos
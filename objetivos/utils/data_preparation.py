@@ -0,0 +1,240 @@
+from typing import Dict, Tuple
+import pandas as pd
+
+from .instrumentation import profiled
+
+DATE_VARS = ['shipping_limit_date', 'order_purchase_timestamp', 'order_approved_at', 'order_delivered_carrier_date',
+             'order_delivered_customer_date', 'order_estimated_delivery_date', 'review_creation_date', 'review_answer_timestamp']
+
+
+def clean_file_name(file_name: str) -> str:
+    if file_name.startswith("olist_") and file_name.endswith("_dataset.csv"):
+        return file_name.removeprefix("olist_").removesuffix("_dataset.csv")
+    elif file_name.endswith(".csv"):
+        return file_name.removesuffix(".csv")
+    return file_name
+
+
+@profiled()
+def convert_dataframes_types(dataframes: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Converte as variáveis de data para datetime (truncadas no minuto) e as variáveis 'object' para 'category'.
+
+    Parâmetros:
+    -----------
+    dataframes : Dict[str, pd.DataFrame]
+        Dicionário com os dataframes importados.
+
+    Retorno:
+    --------
+    Dict[str, pd.DataFrame]
+        O mesmo dicionário, com os tipos dos dataframes convertidos.
+    """
+    # Transformando os tipos de variáveis de data para datetime.
+    for df in dataframes.values():
+        for col in DATE_VARS:
+            if col in list(df.columns):
+                df[col] = pd.to_datetime(df[col])
+                df[col] = df[col].dt.floor('min')
+
+    # Transformando todos os tipos 'object' dos dataframes para 'category', com o objetivo de aumentar a eficiência nas manipulações.
+    for df in dataframes.values():
+        for col in df.select_dtypes(include= ['object', 'string']).columns:
+            df[col] = df[col].astype('category')
+
+    return dataframes
+
+
+def __interpolate_date(start: pd.Series, end: pd.Series,
+                      fraction: float) -> pd.Series:
+    delta = (end - start)
+
+    return start + (delta * fraction)
+
+
+def __replace_na_values_when_approved_and_carrier_date_var_are(df: pd.DataFrame) -> pd.DataFrame:
+    mask_a = (df['order_delivered_customer_date'].notna() &
+              df['order_approved_at'].isna() &
+              df['order_delivered_carrier_date'].isna())
+
+    if mask_a.any():
+        df.loc[mask_a, 'order_approved_at'] = __interpolate_date(
+            df.loc[mask_a, 'order_purchase_timestamp'],
+            df.loc[mask_a, 'order_delivered_customer_date'],
+            1/3
+        )
+        df.loc[mask_a, 'order_delivered_carrier_date'] = __interpolate_date(
+            df.loc[mask_a, 'order_approved_at'],
+            df.loc[mask_a, 'order_delivered_customer_date'],
+            1/2
+        )
+
+    return df
+
+
+def __replace_na_values_when_approved_date_var_is(df: pd.DataFrame) -> pd.DataFrame:
+    mask_b = df['order_delivered_customer_date'].notna() & df['order_approved_at'].isna()
+
+    if mask_b.any():
+        df.loc[mask_b, 'order_approved_at'] = __interpolate_date(
+            df.loc[mask_b, 'order_purchase_timestamp'],
+            df.loc[mask_b, 'order_delivered_carrier_date'],
+            1/2
+        )
+
+    return df
+
+
+def __replace_na_values_when_carrier_date_var_is(df: pd.DataFrame) -> pd.DataFrame:
+    mask_c = df['order_delivered_customer_date'].notna() & df['order_delivered_carrier_date'].isna()
+
+    if mask_c.any():
+        df.loc[mask_c, 'order_delivered_carrier_date'] = __interpolate_date(
+            df.loc[mask_c, 'order_approved_at'],
+            df.loc[mask_c, 'order_delivered_customer_date'],
+            1/2
+        )
+
+    return df
+
+
+def __replace_delivered_to_approved(df: pd.DataFrame, delivered_mask) -> pd.DataFrame:
+    mask_d = df['order_delivered_customer_date'].isna() & df['order_delivered_carrier_date'].isna()
+    if mask_d.any():
+        df.loc[delivered_mask & mask_d, 'order_status'] = 'approved'
+
+    return df
+
+
+def __replace_delivered_to_shipped(df: pd.DataFrame, delivered_mask) -> pd.DataFrame:
+    mask_e = df['order_delivered_customer_date'].isna() & df['order_delivered_carrier_date'].notna()
+    if mask_e.any():
+        df.loc[delivered_mask & mask_e, 'order_status'] = 'shipped'
+
+    return df
+
+
+@profiled()
+def treat_delivered_anomalies(orders: pd.DataFrame) -> pd.DataFrame:
+    """
+    Corrige valores faltantes nos pedidos cujo order_status == 'delivered'
+    seguindo a estratégia combinada:
+
+    - Imputa datas faltantes (‘order_approved_at’, ‘order_delivered_carrier_date’)
+      quando ‘order_delivered_customer_date’ está presente.
+    - Converte status para 'approved' quando apenas 'order_approved_at' está preenchido.
+    - Converte status para 'shipped' quando apenas ‘order_delivered_customer_date’ está ausente.
+
+    Retorna:
+        df_corrigido
+    """
+    na_values_orders = orders[orders.isna().any(axis=1)]
+    delivered_mask = na_values_orders['order_status'] == 'delivered'
+    df = na_values_orders.loc[delivered_mask].copy()
+
+    if isinstance(df['order_status'].dtype, pd.CategoricalDtype):
+        new_status = [status for status in ['approved', 'shipped'] if status not in df['order_status'].cat.categories]
+        df['order_status'] = df['order_status'].cat.add_categories(new_status)
+
+    # --- Etapa 1 - 'order_delivered_customer_date' preenchidos
+    # A: 'order_approved_at' & 'order_delivered_carrier_date' faltantes
+    df = __replace_na_values_when_approved_and_carrier_date_var_are(df)
+
+    # B: 'order_approved_at' ausentes
+    df = __replace_na_values_when_approved_date_var_is(df)
+
+    # C: 'order_delivered_carrier_date' ausentes
+    df = __replace_na_values_when_carrier_date_var_is(df)
+
+    # --- Etapa 2 - 'order_delivered_customer_date' ausentes
+    # D. 'order_approved_at' preenchidos e 'order_delivered_carrier_date' ausentes
+    df = __replace_delivered_to_approved(df, delivered_mask)
+
+    # E. só 'order_delivered_customer_date' ausentes
+    df = __replace_delivered_to_shipped(df, delivered_mask)
+
+
+    return df
+
+
+@profiled()
+def update_orders(orders: pd.DataFrame, treated_orders: pd.DataFrame) -> pd.DataFrame:
+    """
+    Atualiza o dataset de pedidos com os registros corrigidos por 'treat_delivered_anomalies'.
+
+    Parâmetros:
+    -----------
+    orders : pd.DataFrame
+        Dataset de pedidos original.
+
+    treated_orders : pd.DataFrame
+        Registros de pedidos corrigidos.
+
+    Retorno:
+    --------
+    pd.DataFrame
+        Novo DataFrame de pedidos com as correções aplicadas.
+    """
+    orders = orders.set_index('order_id')
+    treated_orders = treated_orders.set_index('order_id')
+
+    # Status criados na correção ('approved', 'shipped') precisam existir nas categorias de ambos os datasets
+    for col in treated_orders.select_dtypes(include= 'category').columns:
+        if isinstance(orders[col].dtype, pd.CategoricalDtype):
+            new_categories = treated_orders[col].cat.categories.difference(orders[col].cat.categories)
+            orders[col] = orders[col].cat.add_categories(new_categories)
+            treated_orders[col] = treated_orders[col].cat.set_categories(orders[col].cat.categories)
+
+    # Merge dos dados corrigidos com o dataset orders
+    orders.update(treated_orders)
+
+    return orders.reset_index()
+
+
+@profiled()
+def merge_dataframes(dataframes: Dict[str, pd.DataFrame]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Une os datasets da Olist em um único DataFrame geral e em um DataFrame para a predição de atraso.
+
+    Parâmetros:
+    -----------
+    dataframes : Dict[str, pd.DataFrame]
+        Dicionário com os datasets tratados ('orders', 'order_items', 'products', 'sellers',
+        'customers', 'geolocation', 'order_payments' e 'order_reviews').
+
+    Retorno:
+    --------
+    Tuple[pd.DataFrame, pd.DataFrame]
+        O DataFrame geral (com pagamentos e avaliações) e o DataFrame de predição de atraso
+        (pedidos, itens, produtos, vendedores e clientes).
+    """
+    orders = dataframes['orders']
+    order_items = dataframes['order_items']
+    payments = dataframes['order_payments']
+    order_reviews = dataframes['order_reviews']
+    products = dataframes['products']
+    customers = dataframes['customers']
+    sellers = dataframes['sellers']
+    geolocation = dataframes['geolocation']
+
+    df = orders.merge(order_items, on= 'order_id', how= 'left')
+    df = df.merge(products, on= 'product_id', how= 'left')
+
+    sellers = sellers.merge(geolocation[['geolocation_zip_code_prefix', 'geolocation_lat', 'geolocation_lng']], left_on= 'seller_zip_code_prefix', right_on= 'geolocation_zip_code_prefix', how= 'left')
+    sellers = sellers.rename(columns= {'geolocation_lat': 'seller_lat', 'geolocation_lng': 'seller_lng'})
+
+    customers = customers.merge(geolocation[['geolocation_zip_code_prefix', 'geolocation_lat', 'geolocation_lng']], left_on= 'customer_zip_code_prefix', right_on= 'geolocation_zip_code_prefix', how= 'left')
+    customers = customers.rename(columns= {'geolocation_lat': 'customer_lat', 'geolocation_lng': 'customer_lng'})
+
+    sellers = sellers.drop(columns= 'geolocation_zip_code_prefix')
+    customers = customers.drop(columns= 'geolocation_zip_code_prefix')
+
+    df = df.merge(sellers, on= 'seller_id', how= 'left')
+    df = df.merge(customers, on= 'customer_id', how= 'left')
+
+    delay_prediction_df = df.copy()
+
+    df = df.merge(payments, on= 'order_id', how= 'left')
+    df = df.merge(order_reviews, on= 'order_id', how= 'left')
+
+    return df, delay_prediction_df
@@ -0,0 +1,429 @@
+from typing import List, Union
+from pathlib import Path
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from .data_preparation import convert_dataframes_types
+from .instrumentation import profiled
+
+PARTITION_COL = 'purchase_year_month'
+
+PARTITIONING = ds.partitioning(pa.schema([(PARTITION_COL, pa.string())]), flavor= 'hive')
+
+# Variáveis pelas quais os registros são ordenados dentro de cada partição. Elas são gravadas como texto: o
+# pyarrow não descarta row groups pelas estatísticas (mín./máx.) de variáveis codificadas em dicionário
+SORT_COLS = ['customer_state']
+
+# Row groups pequenos o bastante para que, com os registros ordenados, cada um cubra poucos estados
+ROWS_PER_GROUP = 4096
+
+VERSION_METADATA_KEY = 'dataset_version'
+
+# Valor de 'pd.NaT' na representação int64 das datas
+NAT_VALUE = np.iinfo(np.int64).min
+
+# Tabelas mapeadas e DataFrames compartilhados pelo processo:
+# {arquivo IPC: (versão, pa.Table)} e {(arquivo IPC, colunas): (versão, pd.DataFrame)}
+_shared_tables = {}
+_shared_frames = {}
+_shared_lock = threading.Lock()
+
+
+def __high_cardinality_categories_to_string(df: pd.DataFrame, n_row_groups: int) -> pd.DataFrame:
+    # O dicionário completo de uma variável 'category' é repetido em cada row group gravado (e em cada
+    # fragmento lido). Identificadores como 'order_id' são gravados como texto, que o Parquet já
+    # codifica com um dicionário próprio por row group, contendo apenas os valores presentes
+    for col in df.select_dtypes(include= 'category').columns:
+        if len(df[col].cat.categories) * n_row_groups > df.shape[0]:
+            df[col] = df[col].astype('object')
+
+    return df
+
+
+@profiled()
+def save_partitioned_dataset(df: pd.DataFrame, dataset_path: Union[str, Path]) -> None:
+    """
+    Salva um DataFrame como dataset Parquet particionado pelo ano-mês da compra ('purchase_year_month').
+
+    Dentro de cada partição os registros são ordenados por 'customer_state' e gravados em row groups de
+    'ROWS_PER_GROUP' registros: cada row group cobre poucos estados, e as suas estatísticas permitem que
+    os filtros por estado ('read_partitioned_dataset') descartem os demais sem lê-los.
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame
+        DataFrame contendo a variável 'order_purchase_timestamp'.
+
+    dataset_path : str | Path
+        Diretório de destino do dataset. O dataset existente é substituído por completo, inclusive
+        os meses ausentes do novo DataFrame.
+
+    Retorno:
+    --------
+    None
+        A função não retorna nenhum valor. Ela grava o dataset em disco.
+    """
+    df = convert_dataframes_types({'df': df.copy()})['df']
+
+    df[PARTITION_COL] = df['order_purchase_timestamp'].dt.strftime('%Y-%m')
+
+    n_row_groups = int(np.ceil(df.groupby(PARTITION_COL).size() / ROWS_PER_GROUP).sum())
+    df = __high_cardinality_categories_to_string(df, n_row_groups)
+
+    sort_cols = [col for col in SORT_COLS if col in df.columns]
+    df = df.astype({col: 'object' for col in sort_cols})
+    df = df.sort_values([PARTITION_COL] + sort_cols, kind= 'stable')
+
+    table = pa.Table.from_pandas(df, preserve_index= False)
+
+    # O dataset é gravado em um diretório temporário ao lado do destino e trocado pelo existente ao final
+    dataset_path = Path(dataset_path)
+    dataset_path.parent.mkdir(parents= True, exist_ok= True)
+    new_path = dataset_path.parent / f'.{dataset_path.name}-{uuid.uuid4().hex}'
+
+    try:
+        # 'preserve_order' mantém a ordenação por 'customer_state' dentro de cada arquivo
+        ds.write_dataset(table, new_path, format= 'parquet', partitioning= PARTITIONING,
+                         min_rows_per_group= ROWS_PER_GROUP, max_rows_per_group= ROWS_PER_GROUP,
+                         preserve_order= True)
+    except BaseException:
+        shutil.rmtree(new_path, ignore_errors= True)
+        raise
+
+    old_path = dataset_path.parent / f'.{dataset_path.name}-old-{uuid.uuid4().hex}'
+    if dataset_path.exists():
+        os.replace(dataset_path, old_path)
+
+    os.replace(new_path, dataset_path)
+    shutil.rmtree(old_path, ignore_errors= True)
+
+    return None
+
+
+def __end_bound(end_date: Union[str, pd.Timestamp]) -> pd.Timestamp:
+    # Limite superior exclusivo: uma data em texto inclui todo o período informado ('2018-06-30' inclui
+    # o dia inteiro e '2018-06', o mês inteiro), e um Timestamp é incluído exatamente
+    if isinstance(end_date, str):
+        return (pd.Period(end_date) + 1).start_time
+
+    return pd.Timestamp(end_date) + pd.Timedelta(1, 'ns')
+
+
+def __build_filter(start_date: str = None, end_date: str = None, states: List[str] = None) -> ds.Expression:
+    filters = []
+
+    # Filtros na variável de partição descartam diretórios inteiros sem abrir os arquivos
+    if start_date is not None:
+        start_date = pd.Timestamp(start_date)
+        filters.append(ds.field(PARTITION_COL) >= start_date.strftime('%Y-%m'))
+        filters.append(ds.field('order_purchase_timestamp') >= start_date)
+
+    if end_date is not None:
+        end_bound = __end_bound(end_date)
+        filters.append(ds.field(PARTITION_COL) <= (end_bound - pd.Timedelta(1, 'ns')).strftime('%Y-%m'))
+        filters.append(ds.field('order_purchase_timestamp') < end_bound)
+
+    if states is not None:
+        filters.append(ds.field('customer_state').isin(list(states)))
+
+    if not filters:
+        return None
+
+    expression = filters[0]
+    for item in filters[1:]:
+        expression = expression & item
+
+    return expression
+
+
+@profiled()
+def read_partitioned_dataset(dataset_path: Union[str, Path], columns: List[str] = None, start_date: str = None,
+                             end_date: str = None, states: List[str] = None) -> pd.DataFrame:
+    """
+    Lê um dataset Parquet particionado, carregando apenas as colunas e partições necessárias.
+
+    Parâmetros:
+    -----------
+    dataset_path : str | Path
+        Diretório do dataset gravado por 'save_partitioned_dataset'.
+
+    columns : List[str]
+        Colunas a serem carregadas. Se None, carrega todas as colunas.
+
+    start_date : str
+        Data mínima (inclusiva) de 'order_purchase_timestamp'.
+
+    end_date : str
+        Data máxima (inclusiva) de 'order_purchase_timestamp'. Datas sem horário incluem o dia inteiro
+        (ex.: '2018-06-30' inclui as compras até 23:59:59 desse dia).
+
+    states : List[str]
+        Estados ('customer_state') a serem mantidos.
+
+    Retorno:
+    --------
+    pd.DataFrame
+        DataFrame com as colunas e registros selecionados.
+    """
+    dataset = ds.dataset(dataset_path, format= 'parquet', partitioning= PARTITIONING)
+
+    table = dataset.to_table(columns= columns, filter= __build_filter(start_date, end_date, states))
+
+    return table.to_pandas()
+
+
+def dataset_version(dataset_path: Union[str, Path]) -> str:
+    """
+    Identifica a versão gravada de um dataset a partir do nome, tamanho e data de modificação dos seus arquivos.
+    Uma nova gravação com 'save_partitioned_dataset' gera uma nova versão.
+
+    Parâmetros:
+    -----------
+    dataset_path : str | Path
+        Diretório do dataset.
+
+    Retorno:
+    --------
+    str
+        Hash da versão do dataset (usado como chave dos caches do dashboard).
+    """
+    dataset_path = Path(dataset_path)
+
+    signature = []
+    for file in sorted(dataset_path.rglob('*.parquet')):
+        stat = file.stat()
+        signature.append((file.relative_to(dataset_path).as_posix(), stat.st_size, stat.st_mtime_ns))
+
+    return hashlib.md5(repr(signature).encode()).hexdigest()
+
+
+def __zero_copy_columns(table: pa.Table) -> pa.Table:
+    columns = []
+    for field, column in zip(table.schema, table.columns):
+        # Sem bitmap de validade a conversão para o pandas reaproveita o buffer mapeado em memória:
+        # os nulos são gravados com os sentinelas do pandas (NaN e NaT)
+        if pa.types.is_floating(field.type):
+            column = pc.fill_null(column, float('nan'))
+        elif pa.types.is_timestamp(field.type) and field.type.unit == 'ns' and field.type.tz is None:
+            column = pc.fill_null(column.cast(pa.int64()), NAT_VALUE).cast(field.type)
+        elif pa.types.is_string(field.type):
+            column = pc.dictionary_encode(column)
+
+        columns.append(column)
+
+    # Um único dicionário e um único bloco contíguo por variável
+    return pa.table(columns, names= table.column_names).unify_dictionaries().combine_chunks()
+
+
+@profiled()
+def export_arrow_ipc(dataset_path: Union[str, Path], ipc_path: Union[str, Path] = None, columns: List[str] = None) -> Path:
+    """
+    Grava um dataset particionado em um único arquivo Arrow IPC sem compressão, próprio para ser mapeado
+    em memória e compartilhado entre as sessões e os processos do dashboard.
+
+    A exportação carrega as colunas em memória, por isso é feita na preparação dos dados, junto com
+    'save_partitioned_dataset', e não pelo dashboard.
+
+    Parâmetros:
+    -----------
+    dataset_path : str | Path
+        Diretório do dataset gravado por 'save_partitioned_dataset'.
+
+    ipc_path : str | Path
+        Arquivo de destino. Se None, utiliza '<dataset_path>.arrow'.
+
+    columns : List[str]
+        Colunas exportadas (ex.: 'dashboard_data.DASHBOARD_COLS'). Se None, exporta todas as colunas.
+
+    Retorno:
+    --------
+    Path
+        Caminho do arquivo gravado.
+    """
+    ipc_path = Path(ipc_path or f'{dataset_path}.arrow')
+
+    dataset = ds.dataset(dataset_path, format= 'parquet', partitioning= PARTITIONING)
+    table = __zero_copy_columns(dataset.to_table(columns= columns))
+    table = table.replace_schema_metadata({VERSION_METADATA_KEY: dataset_version(dataset_path)})
+
+    # Gravação atômica: processos que já mapearam a versão anterior continuam lendo o arquivo antigo
+    tmp_path = ipc_path.with_name(f'{ipc_path.name}.{os.getpid()}.tmp')
+    with pa.OSFile(str(tmp_path), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, ipc_path)
+
+    return ipc_path
+
+
+def open_memory_mapped_table(ipc_path: Union[str, Path]) -> pa.Table:
+    """
+    Abre um arquivo Arrow IPC mapeado em memória. Os buffers da tabela apontam para as páginas do arquivo:
+    nada é copiado e as páginas são compartilhadas, pelo sistema operacional, entre os processos.
+    """
+    return pa.ipc.open_file(pa.memory_map(str(ipc_path), 'r')).read_all()
+
+
+def load_shared_dataframe(dataset_path: Union[str, Path], columns: List[str] = None) -> pd.DataFrame:
+    """
+    Carrega as colunas de um dataset uma única vez por processo, como um DataFrame somente leitura sobre
+    o arquivo Arrow IPC mapeado em memória ('<dataset_path>.arrow', gravado por 'export_arrow_ipc').
+
+    As variáveis numéricas e de data não são copiadas, e as variáveis 'category' copiam apenas os códigos.
+    Se o arquivo estiver ausente, desatualizado ou sem alguma das colunas, as colunas são lidas do dataset
+    Parquet (uma cópia por processo). Nada é gravado: o diretório dos dados pode ser somente leitura.
+
+    Chamadas seguintes, de qualquer sessão, retornam o mesmo DataFrame: ele não deve ser alterado, e as
+    seleções devem ser feitas com indexação booleana. Uma nova versão do dataset descarta as anteriores.
+
+    Parâmetros:
+    -----------
+    dataset_path : str | Path
+        Diretório do dataset gravado por 'save_partitioned_dataset'.
+
+    columns : List[str]
+        Colunas a serem carregadas. Se None, carrega todas as colunas.
+
+    Retorno:
+    --------
+    pd.DataFrame
+        DataFrame compartilhado do processo.
+    """
+    ipc_path = Path(f'{dataset_path}.arrow')
+    version = dataset_version(dataset_path)
+    key = (str(ipc_path), None if columns is None else tuple(columns))
+
+    with _shared_lock:
+        cached = _shared_frames.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        # Os DataFrames de versões anteriores (e o mapeamento do arquivo antigo) são liberados
+        stale_keys = [item for item, (item_version, _) in _shared_frames.items()
+                      if item[0] == key[0] and item_version != version]
+        for stale_key in stale_keys:
+            del _shared_frames[stale_key]
+
+        cached = _shared_tables.get(key[0])
+        if cached is not None and cached[0] == version:
+            table = cached[1]
+        elif ipc_path.exists() and __ipc_version(ipc_path) == version:
+            table = open_memory_mapped_table(ipc_path)
+            _shared_tables[key[0]] = (version, table)
+        else:
+            _shared_tables.pop(key[0], None)
+            table = None
+
+        if table is not None and (columns is None or set(columns) <= set(table.column_names)):
+            if columns is not None:
+                table = table.select(columns)
+
+            # 'split_blocks' mantém um bloco por variável, evitando a cópia de consolidação do pandas
+            df = table.to_pandas(split_blocks= True)
+        else:
+            df = read_partitioned_dataset(dataset_path, columns= columns)
+
+        _shared_frames[key] = (version, df)
+
+    return df
+
+
+def __ipc_version(ipc_path: Path) -> str:
+    with pa.memory_map(str(ipc_path), 'r') as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+
+    return metadata.get(VERSION_METADATA_KEY.encode(), b'').decode()
+
+
+def __read_csv_dataset(csv_path: Union[str, Path], columns: List[str] = None, start_date: str = None,
+                       end_date: str = None, states: List[str] = None) -> pd.DataFrame:
+    filter_cols = []
+    if start_date is not None or end_date is not None:
+        filter_cols.append('order_purchase_timestamp')
+    if states is not None:
+        filter_cols.append('customer_state')
+
+    usecols = None if columns is None else list(dict.fromkeys(columns + filter_cols))
+
+    df = convert_dataframes_types({'df': pd.read_csv(csv_path, usecols= usecols)})['df']
+
+    mask = pd.Series(True, index= df.index)
+    if start_date is not None:
+        mask &= df['order_purchase_timestamp'] >= pd.Timestamp(start_date)
+    if end_date is not None:
+        mask &= df['order_purchase_timestamp'] < __end_bound(end_date)
+    if states is not None:
+        mask &= df['customer_state'].isin(states)
+
+    df = df.loc[mask]
+
+    if columns is not None:
+        df = df[columns]
+
+    return df
+
+
+def benchmark_load_times(csv_path: Union[str, Path], dataset_path: Union[str, Path], columns: List[str] = None,
+                         start_date: str = None, end_date: str = None, states: List[str] = None,
+                         n_runs: int = 3) -> pd.DataFrame:
+    """
+    Compara o tempo de carregamento do CSV comprimido com o do dataset Parquet particionado.
+
+    São medidos três cenários: leitura completa, leitura apenas das colunas informadas e leitura
+    das colunas informadas com os filtros de data e estado aplicados.
+
+    Parâmetros:
+    -----------
+    csv_path : str | Path
+        Caminho do arquivo CSV (ex.: 'clean_general_df.csv.gz').
+
+    dataset_path : str | Path
+        Diretório do dataset Parquet equivalente.
+
+    columns, start_date, end_date, states :
+        Seleção utilizada nos cenários com projeção e filtro (ver 'read_partitioned_dataset').
+
+    n_runs : int
+        Quantidade de repetições de cada leitura.
+
+    Retorno:
+    --------
+    pd.DataFrame
+        DataFrame com o tempo médio (em segundos) e a quantidade de registros de cada cenário e formato.
+    """
+    scenarios = {
+        'Leitura completa': {},
+        'Projeção de colunas': {'columns': columns},
+        'Projeção e filtros': {'columns': columns, 'start_date': start_date, 'end_date': end_date, 'states': states}
+    }
+
+    readers = {
+        'CSV': lambda kwargs: __read_csv_dataset(csv_path, **kwargs),
+        'Parquet': lambda kwargs: read_partitioned_dataset(dataset_path, **kwargs)
+    }
+
+    results = []
+    for scenario, kwargs in scenarios.items():
+        for file_format, reader in readers.items():
+            times = []
+            for _ in range(n_runs):
+                start = time.perf_counter()
+                df = reader(kwargs)
+                times.append(time.perf_counter() - start)
+
+            results.append({
+                'cenario': scenario,
+                'formato': file_format,
+                'tempo_medio_s': round(sum(times) / n_runs, 4),
+                'registros': df.shape[0]
+            })
+
+    return pd.DataFrame(results)
@@ -0,0 +1,146 @@
+from typing import Tuple
+import pandas as pd
+from sklearn.preprocessing import RobustScaler, OneHotEncoder
+from sklearn.compose import ColumnTransformer
+from imblearn.pipeline import Pipeline
+from xgboost import XGBClassifier
+
+# Variáveis do dataset 'delay_prediction_dataset' utilizadas na preparação (os identificadores não são carregados)
+DATASET_COLS = ['order_status', 'order_purchase_timestamp', 'order_delivered_carrier_date', 'order_delivered_customer_date',
+                'order_estimated_delivery_date', 'price', 'freight_value', 'product_category_name', 'product_weight_g',
+                'product_length_cm', 'product_height_cm', 'product_width_cm', 'seller_zip_code_prefix', 'seller_city',
+                'seller_state', 'seller_lat', 'seller_lng', 'customer_zip_code_prefix', 'customer_city', 'customer_state',
+                'customer_lat', 'customer_lng']
+
+CONTINUOUS_VARS = ['price', 'freight_value', 'seller_lat', 'seller_lng', 'customer_lat', 'customer_lng']
+
+DISCRETE_VARS = ["order_purchase_month", "order_delivered_carrier_month"]
+
+NOMINAL_VARS = ['seller_zip_code_prefix', 'seller_city', 'seller_state',
+                'customer_zip_code_prefix', 'customer_city', 'customer_state']
+
+
+def prepare_delay_prediction_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Trata o DataFrame de predição de atraso: mantém apenas pedidos entregues, substitui valores faltantes,
+    converte os tipos e cria a variável alvo ('order_delayed') e as variáveis de mês.
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame
+        DataFrame 'delay_prediction_df' gerado na preparação dos dados (ao menos com as variáveis de 'DATASET_COLS').
+
+    Retorno:
+    --------
+    pd.DataFrame
+        DataFrame tratado, com a variável alvo e as variáveis explicativas.
+    """
+    df = df.loc[(df['order_status'] == 'delivered'), DATASET_COLS].copy()
+
+    # Substituição de valores faltantes
+    num_vars_with_na_values = ['product_weight_g', 'product_length_cm', 'product_height_cm', 'product_width_cm',
+                               'seller_lat', 'seller_lng', 'customer_lat', 'customer_lng']
+
+    for var in num_vars_with_na_values:
+        df.fillna({var: 0}, inplace= True)
+
+    if isinstance(df['product_category_name'].dtype, pd.CategoricalDtype):
+        df['product_category_name'] = df['product_category_name'].cat.add_categories("indefinido")
+    df.fillna({'product_category_name': "indefinido"}, inplace= True)
+
+    # Transformando os tipos de variáveis de data para datetime.
+    date_vars = ['order_purchase_timestamp', 'order_delivered_carrier_date',
+                 'order_delivered_customer_date', 'order_estimated_delivery_date']
+
+    for col in date_vars:
+        df[col] = pd.to_datetime(df[col], format="mixed", dayfirst= False, errors="coerce")
+        df[col] = df[col].dt.floor('s')
+
+    for col in df.select_dtypes(include= ['object', 'string']).columns:
+        df[col] = df[col].astype('category')
+
+    # Variável Alvo: pedido atrasou
+    df['order_delayed'] = ((df['order_status'] == 'delivered') &
+                           (df['order_delivered_customer_date'] > df['order_estimated_delivery_date'])).astype(int)
+
+    # Obtendo o mês em que a compra foi feita e o mês em que o produto chegou no entregador
+    df['order_purchase_month'] = df['order_purchase_timestamp'].dt.month
+    df['order_delivered_carrier_month'] = df['order_delivered_carrier_date'].dt.month
+
+    # Removendo as variáveis que não serão utilzadas.
+    drop_cols = ['order_status', 'order_purchase_timestamp', 'order_delivered_carrier_date',
+                 'order_delivered_customer_date', 'order_estimated_delivery_date']
+
+    df.drop(columns= drop_cols, inplace= True)
+
+    return df
+
+
+def split_features_and_target(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Separa as variáveis selecionadas para a modelagem ('CONTINUOUS_VARS', 'NOMINAL_VARS' e 'DISCRETE_VARS')
+    da variável alvo.
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame
+        DataFrame retornado por 'prepare_delay_prediction_df'.
+
+    Retorno:
+    --------
+    Tuple[pd.DataFrame, pd.Series]
+        As variáveis explicativas (X) e a variável alvo (y).
+    """
+    X = df[CONTINUOUS_VARS + NOMINAL_VARS + DISCRETE_VARS].copy()
+    y = df['order_delayed'].copy()
+
+    return X, y
+
+
+def build_xgb_pipeline(n_jobs: int = 8) -> Pipeline:
+    """
+    Cria o pipeline de pré-processamento e treinamento do modelo XGBoost de predição de atraso.
+
+    Parâmetros:
+    -----------
+    n_jobs : int
+        Quantidade de threads utilizadas pelo XGBoost.
+
+    Retorno:
+    --------
+    Pipeline
+        Pipeline com o pré-processador e o classificador.
+    """
+    # Instaciando e criando transformadores para os dados
+    robust_transformer = RobustScaler()
+    one_hot_transformer = OneHotEncoder(feature_name_combiner='concat', handle_unknown= 'ignore')
+
+    # Criando pré processador de dados para o treinamento dos modelos
+    preprocessor = ColumnTransformer(
+                       transformers= [
+                           ('RobustScalingTransformation', robust_transformer, CONTINUOUS_VARS),
+                           ('OneHotEncodingTransformation', one_hot_transformer, NOMINAL_VARS),
+                           ('PassthroughVars', 'passthrough', DISCRETE_VARS)])
+
+    xgb_model = XGBClassifier(
+        n_estimators=600,
+        learning_rate=0.05,
+        max_depth=9,
+        min_child_weight= 7,
+        gamma=1.0,
+        subsample=0.8,
+        colsample_bytree=0.6,
+        reg_alpha=0.5,
+        reg_lambda=1.3,
+        scale_pos_weight= 7.3,
+        objective='binary:logistic',
+        eval_metric='auc',
+        random_state=33,
+        n_jobs=n_jobs
+    )
+
+    # Criando pipeline para transformação de dados e treinamento do modelo XGBoost
+    xgb_pipeline = Pipeline(steps=[('preprocessor', preprocessor),
+                                   ('xgb', xgb_model)])
+
+    return xgb_pipeline
@@ -0,0 +1,414 @@
+from typing import Callable, Dict, List
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from functools import wraps
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+import pandas as pd
+
+# Caminho do log JSON-lines gravado ao final de cada execução (opcional)
+LOG_PATH_ENV_VAR = 'TRIGGO_PERF_LOG'
+
+MAX_RUNS = 50
+
+_state = {'enabled': False, 'track_memory': True, 'tracing': False, 'log_path': os.environ.get(LOG_PATH_ENV_VAR)}
+_local = threading.local()
+_runs = deque(maxlen= MAX_RUNS)
+
+# O tracemalloc é global no processo: ele permanece ligado enquanto houver execuções que o utilizam
+# ('holders'), e 'generation' muda a cada nova execução para identificar etapas com execuções concorrentes
+_tracing = {'holders': 0, 'generation': 0, 'started': False}
+_tracing_lock = threading.Lock()
+
+
+class StageRecord:
+    """
+    Medições de uma etapa instrumentada: tempo de parede, tempo de CPU, pico de memória e quantidade de registros.
+    """
+    __slots__ = ('name', 'started_at', 'wall_time_s', 'cpu_time_s', 'peak_memory_mb', 'rows_in', 'rows_out')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now().isoformat(timespec= 'milliseconds')
+        self.wall_time_s = None
+        self.cpu_time_s = None
+        self.peak_memory_mb = None
+        self.rows_in = None
+        self.rows_out = None
+
+    def to_dict(self) -> Dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class Run:
+    """
+    Agrupa as etapas medidas em uma execução (ex.: um rerun de uma página do dashboard).
+    """
+    def __init__(self, label: str, enabled: bool = True):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.enabled = enabled
+        self.started_at = datetime.now().isoformat(timespec= 'milliseconds')
+        self.wall_time_s = None
+        self.stages: List[StageRecord] = []
+        self._start = time.perf_counter()
+        self._tracing = False
+
+    def to_dict(self) -> Dict:
+        return {
+            'run_id': self.run_id,
+            'label': self.label,
+            'started_at': self.started_at,
+            'wall_time_s': self.wall_time_s,
+            'stages': [record.to_dict() for record in self.stages]
+        }
+
+
+class _NullRecord:
+    # Registro descartado quando a instrumentação está desabilitada
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_CONTEXT = nullcontext(_NullRecord())
+
+
+def enable(track_memory: bool = True, log_path: str = None) -> None:
+    """
+    Habilita a instrumentação em todo o processo (ex.: notebooks e scripts de preparação dos dados).
+
+    Parâmetros:
+    -----------
+    track_memory : bool
+        Se True, mede o pico de memória das etapas com tracemalloc (aumenta o custo das alocações).
+        O pico só é registrado nas etapas executadas sem outras execuções medidas em paralelo.
+
+    log_path : str
+        Arquivo JSON-lines em que cada execução finalizada é registrada.
+    """
+    _state['enabled'] = True
+    _state['track_memory'] = track_memory
+    if log_path is not None:
+        _state['log_path'] = log_path
+
+    if track_memory and not _state['tracing']:
+        __acquire_tracing()
+        _state['tracing'] = True
+    elif not track_memory and _state['tracing']:
+        __release_tracing()
+        _state['tracing'] = False
+
+    return None
+
+
+def disable() -> None:
+    _state['enabled'] = False
+
+    if _state['tracing']:
+        __release_tracing()
+        _state['tracing'] = False
+
+    return None
+
+
+def __acquire_tracing() -> None:
+    with _tracing_lock:
+        _tracing['holders'] += 1
+        _tracing['generation'] += 1
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing['started'] = True
+
+    return None
+
+
+def __release_tracing() -> None:
+    with _tracing_lock:
+        _tracing['holders'] -= 1
+        # Só desliga o rastreamento iniciado pela instrumentação (ex.: não o do benchmark do pipeline)
+        if _tracing['holders'] == 0 and _tracing['started']:
+            tracemalloc.stop()
+            _tracing['started'] = False
+
+    return None
+
+
+def is_enabled() -> bool:
+    current_run = getattr(_local, 'run', None)
+
+    return _state['enabled'] or (current_run is not None and current_run.enabled)
+
+
+def start_run(label: str, enabled: bool = True) -> Run:
+    """
+    Inicia uma execução na thread atual. As etapas medidas até 'end_run' são associadas a ela.
+
+    Parâmetros:
+    -----------
+    label : str
+        Nome da execução (ex.: nome da página do dashboard).
+
+    enabled : bool
+        Se False, as etapas da execução não são medidas (e o tracemalloc não é ligado por ela).
+
+    Retorno:
+    --------
+    Run
+        A execução iniciada.
+    """
+    # Uma execução interrompida antes de 'end_run' não pode manter o tracemalloc ligado
+    previous_run = getattr(_local, 'run', None)
+    if previous_run is not None and previous_run._tracing:
+        __release_tracing()
+        previous_run._tracing = False
+
+    current_run = Run(label, enabled)
+    _local.run = current_run
+    _local.stack = []
+
+    if enabled and _state['track_memory']:
+        __acquire_tracing()
+        current_run._tracing = True
+
+    return current_run
+
+
+def end_run(current_run: Run) -> Run:
+    """
+    Finaliza a execução, registra-a no histórico do processo e, se configurado, no log JSON-lines.
+    """
+    current_run.wall_time_s = round(time.perf_counter() - current_run._start, 6)
+
+    if getattr(_local, 'run', None) is current_run:
+        _local.run = None
+
+    if current_run._tracing:
+        __release_tracing()
+        current_run._tracing = False
+
+    if current_run.enabled:
+        __register(current_run)
+
+    return current_run
+
+
+def __register(current_run: Run) -> None:
+    _runs.append(current_run)
+
+    if _state['log_path']:
+        export_jsonl(_state['log_path'], [current_run])
+
+    return None
+
+
+@contextmanager
+def run(label: str, enabled: bool = True):
+    current_run = start_run(label, enabled)
+    try:
+        yield current_run
+    finally:
+        end_run(current_run)
+
+
+@contextmanager
+def __measure(name: str):
+    record = StageRecord(name)
+
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+
+    # O pico do tracemalloc é global: com outra execução medida em paralelo, ele mistura as alocações
+    # das duas e 'reset_peak' descarta o pico da outra, por isso não é medido (peak_memory_mb = None)
+    with _tracing_lock:
+        generation = _tracing['generation']
+        tracing = tracemalloc.is_tracing() and _tracing['holders'] <= 1
+        if tracing:
+            start_memory, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+    # [pico das etapas internas já encerradas]
+    frame = [0]
+    stack.append(frame)
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield record
+    finally:
+        record.wall_time_s = round(time.perf_counter() - wall_start, 6)
+        record.cpu_time_s = round(time.process_time() - cpu_start, 6)
+        stack.pop()
+        _local.n_stages = getattr(_local, 'n_stages', 0) + 1
+
+        with _tracing_lock:
+            tracing = (tracing and tracemalloc.is_tracing() and _tracing['holders'] <= 1
+                       and _tracing['generation'] == generation)
+            if tracing:
+                _, peak_memory = tracemalloc.get_traced_memory()
+
+        if tracing:
+            # 'reset_peak' das etapas internas descarta o pico anterior, por isso ele é propagado pela pilha
+            peak_memory = max(peak_memory, frame[0])
+            record.peak_memory_mb = round(max(peak_memory - start_memory, 0) / 2**20, 3)
+
+            if stack:
+                stack[-1][0] = max(stack[-1][0], peak_memory)
+
+        current_run = getattr(_local, 'run', None)
+        if current_run is not None:
+            current_run.stages.append(record)
+        else:
+            orphan_run = Run(name)
+            orphan_run.stages.append(record)
+            orphan_run.wall_time_s = record.wall_time_s
+            __register(orphan_run)
+
+
+def stage(name: str):
+    """
+    Context manager que mede uma etapa. A quantidade de registros pode ser informada no objeto retornado.
+
+    Exemplo:
+        with instrumentation.stage('load_data') as record:
+            df = pd.read_csv(path)
+            record.rows_out = df.shape[0]
+    """
+    if not is_enabled():
+        return _NULL_CONTEXT
+
+    return __measure(name)
+
+
+@contextmanager
+def __measure_cached(name: str):
+    n_stages = getattr(_local, 'n_stages', 0)
+
+    with __measure(name) as record:
+        yield record
+
+        # Sem etapas internas medidas, a função memorizada não foi executada
+        if getattr(_local, 'n_stages', 0) == n_stages:
+            record.name = f'{name} (cache)'
+
+
+def cached_stage(name: str):
+    """
+    Context manager que mede a chamada de uma função memorizada (ex.: st.cache_data). Quando o resultado
+    vem do cache, a etapa é registrada como '<name> (cache)'; caso contrário, como '<name>', junto das
+    etapas medidas dentro da função (que deve medir ao menos uma etapa).
+
+    Exemplo:
+        with instrumentation.cached_stage('load_sales_df'):
+            sales_df = load_sales_df(data_version)
+    """
+    if not is_enabled():
+        return _NULL_CONTEXT
+
+    return __measure_cached(name)
+
+
+def __count_rows(value) -> int:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.shape[0]
+    if isinstance(value, dict):
+        counts = [__count_rows(item) for item in value.values()]
+        counts = [count for count in counts if count is not None]
+        return sum(counts) if counts else None
+    if isinstance(value, (tuple, list)):
+        for item in value:
+            if isinstance(item, (pd.DataFrame, pd.Series)):
+                return item.shape[0]
+
+    return None
+
+
+def profiled(name: str = None) -> Callable:
+    """
+    Decorador que mede a função como uma etapa. Os registros de entrada e de saída são obtidos do
+    primeiro argumento e do retorno quando são DataFrames (ou tuplas/dicionários de DataFrames).
+
+    Parâmetros:
+    -----------
+    name : str
+        Nome da etapa. Se None, utiliza o nome da função.
+    """
+    def decorator(func: Callable) -> Callable:
+        stage_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return func(*args, **kwargs)
+
+            with __measure(stage_name) as record:
+                first_arg = args[0] if args else next(iter(kwargs.values()), None)
+                record.rows_in = __count_rows(first_arg)
+                result = func(*args, **kwargs)
+                record.rows_out = __count_rows(result)
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def last_runs(n: int = 10) -> List[Run]:
+    """
+    Retorna as últimas 'n' execuções registradas no processo.
+    """
+    return list(_runs)[-n:]
+
+
+def runs_to_dataframe(runs: List[Run]) -> pd.DataFrame:
+    """
+    Converte execuções em um DataFrame com uma linha por etapa.
+    """
+    rows = []
+    for current_run in runs:
+        for record in current_run.stages:
+            rows.append({'run_id': current_run.run_id, 'label': current_run.label,
+                         'run_started_at': current_run.started_at, **record.to_dict()})
+
+    return pd.DataFrame(rows)
+
+
+def to_jsonl(runs: List[Run]) -> str:
+    """
+    Serializa as execuções em JSON-lines, com uma linha por etapa.
+    """
+    lines = []
+    for current_run in runs:
+        for record in current_run.stages:
+            line = {'run_id': current_run.run_id, 'label': current_run.label,
+                    'run_started_at': current_run.started_at, **record.to_dict()}
+            lines.append(json.dumps(line, ensure_ascii= False) + '\n')
+
+    return ''.join(lines)
+
+
+def export_jsonl(path: str, runs: List[Run] = None) -> None:
+    """
+    Acrescenta as execuções ao arquivo JSON-lines, com uma linha por etapa.
+
+    Parâmetros:
+    -----------
+    path : str
+        Caminho do arquivo de log.
+
+    runs : List[Run]
+        Execuções exportadas. Se None, exporta todo o histórico do processo.
+    """
+    runs = list(_runs) if runs is None else runs
+
+    with open(path, 'a', encoding= 'utf-8') as file:
+        file.write(to_jsonl(runs))
+
+    return None
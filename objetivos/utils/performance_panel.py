@@ -0,0 +1,66 @@
+import streamlit as st
+import pandas as pd
+
+from . import instrumentation
+
+HISTORY_KEY = 'performance_runs'
+
+
+def performance_toggle() -> bool:
+    """
+    Adiciona à sidebar a opção de exibir o painel de performance.
+
+    Retorno:
+    --------
+    bool
+        True se o painel deve ser exibido (e as etapas da página medidas).
+    """
+    return st.sidebar.toggle("⏱️ Performance", value= False,
+                             help= "Mede tempo, CPU, memória e registros de cada etapa da página.")
+
+
+def render_performance_panel(current_run: instrumentation.Run, n_runs: int = 10) -> None:
+    """
+    Exibe na sidebar as últimas 'n_runs' execuções da sessão e as etapas da execução atual.
+
+    Parâmetros:
+    -----------
+    current_run : instrumentation.Run
+        Execução da página finalizada com 'instrumentation.end_run'.
+
+    n_runs : int
+        Quantidade de execuções mantidas no histórico da sessão.
+
+    Retorno:
+    --------
+    None
+        A função não retorna nenhum valor. Ela exibe o painel.
+    """
+    if not current_run.enabled:
+        return None
+
+    history = st.session_state.setdefault(HISTORY_KEY, [])
+    history.append(current_run)
+    del history[:-n_runs]
+
+    with st.sidebar.expander("⏱️ Performance", expanded= True):
+        st.caption(f"Execução atual: **{current_run.wall_time_s:.3f}s**")
+
+        stages_df = instrumentation.runs_to_dataframe([current_run])
+        if not stages_df.empty:
+            st.dataframe(stages_df[['name', 'wall_time_s', 'cpu_time_s', 'peak_memory_mb', 'rows_in', 'rows_out']],
+                         hide_index= True)
+
+            if stages_df['peak_memory_mb'].isna().any():
+                st.caption("Pico de memória vazio: a etapa foi executada junto com outra sessão medida, "
+                           "e o tracemalloc (global no processo) não separa as alocações de cada uma.")
+
+        st.caption(f"Últimas {len(history)} execuções")
+        runs_df = pd.DataFrame([{'label': item.label, 'started_at': item.started_at, 'wall_time_s': item.wall_time_s,
+                                 'stages': len(item.stages)} for item in reversed(history)])
+        st.dataframe(runs_df, hide_index= True)
+
+        st.download_button("Exportar JSON-lines", data= instrumentation.to_jsonl(history),
+                           file_name= "performance.jsonl", mime= "application/jsonl")
+
+    return None
@@ -0,0 +1,362 @@
+from typing import Dict, Iterable, List, Union
+from pathlib import Path
+import json
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from .instrumentation import profiled
+
+TEXT_COLS = ['review_comment_title', 'review_comment_message']
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Palavras vazias do português, já sem acentos (são comparadas depois da normalização).
+# Negações como 'não' e 'nunca' são mantidas: elas mudam o sentido dos comentários de satisfação
+STOPWORDS = frozenset("""
+a ao aos aquela aquelas aquele aqueles aquilo as ate com como da das de dela delas dele deles depois do dos
+e ela elas ele eles em entao entre era eram essa essas esse esses esta estas este estes estou eu foi fomos
+for foram fui ha isso isto ja la lhe lhes mais mas me mesma mesmo meu meus minha minhas muito muita na nas
+no nos nossa nossas nosso nossos num numa o os ou pela pelas pelo pelos por porque pra pro qual quando que
+quem se seja sem ser seu seus so sua suas tambem te tem tenho ter teve tinha tu tua tuas um uma umas uns
+vai voce voces vos
+""".split())
+
+
+def normalize_text(text: str) -> str:
+    """
+    Converte o texto para minúsculas e remove os acentos ('Não recebi' -> 'nao recebi').
+    """
+    text = unicodedata.normalize('NFKD', text.lower())
+
+    return text.encode('ascii', 'ignore').decode('ascii')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Normaliza o texto e o divide em termos, descartando palavras vazias e termos de um caractere.
+
+    Parâmetros:
+    -----------
+    text : str
+        Texto do comentário. Valores faltantes resultam em uma lista vazia.
+
+    Retorno:
+    --------
+    List[str]
+        Termos do texto, na ordem em que aparecem.
+    """
+    if not isinstance(text, str):
+        return []
+
+    return [token for token in TOKEN_PATTERN.findall(normalize_text(text)) if len(token) > 1 and token not in STOPWORDS]
+
+
+class ReviewTextIndex:
+    """
+    Índice dos comentários das avaliações: matriz esparsa de contagens (avaliações x termos), matriz TF-IDF
+    e índice invertido (termo -> avaliações), com as linhas identificadas por 'review_id'.
+
+    Os comentários são tokenizados uma única vez, na inclusão da avaliação ('update'). A TF-IDF e o índice
+    invertido são derivados da matriz de contagens e recalculados apenas depois de novas inclusões.
+    """
+    def __init__(self):
+        self.review_ids = np.array([], dtype= object)
+        self.vocabulary: Dict[str, int] = {}
+        self.counts = sp.csr_matrix((0, 0), dtype= np.int32)
+        self._rows = {}
+        self._tfidf = None
+        self._postings = None
+
+    @staticmethod
+    def __review_texts(reviews: pd.DataFrame) -> pd.Series:
+        texts = pd.Series('', index= reviews.index, dtype= object)
+        for col in [col for col in TEXT_COLS if col in reviews.columns]:
+            texts = texts + ' ' + reviews[col].astype(object).fillna('')
+
+        return texts
+
+    @staticmethod
+    def __count_matrix(texts: pd.Series, vocabulary: Dict[str, int]) -> sp.csr_matrix:
+        # Comentários repetidos são tokenizados uma única vez
+        codes, unique_texts = pd.factorize(texts)
+
+        indptr, indices = [0], []
+        for text in unique_texts:
+            for token in tokenize(text):
+                indices.append(vocabulary.setdefault(token, len(vocabulary)))
+            indptr.append(len(indices))
+
+        unique_counts = sp.csr_matrix((np.ones(len(indices), dtype= np.int32), indices, indptr),
+                                      shape= (len(unique_texts), len(vocabulary)))
+        unique_counts.sum_duplicates()
+
+        return unique_counts[codes]
+
+    @classmethod
+    def build(cls, reviews: pd.DataFrame) -> 'ReviewTextIndex':
+        """
+        Cria o índice a partir das avaliações ('review_id', 'review_comment_title' e 'review_comment_message').
+        """
+        index = cls()
+        index.update(reviews)
+
+        return index
+
+    @property
+    def terms(self) -> np.ndarray:
+        terms = np.empty(len(self.vocabulary), dtype= object)
+        for term, col in self.vocabulary.items():
+            terms[col] = term
+
+        return terms
+
+    @profiled('review_text.update')
+    def update(self, reviews: pd.DataFrame) -> int:
+        """
+        Inclui no índice as avaliações ainda não indexadas. Avaliações já presentes são ignoradas.
+
+        Parâmetros:
+        -----------
+        reviews : pd.DataFrame
+            Avaliações com a variável 'review_id' e as variáveis de comentário.
+
+        Retorno:
+        --------
+        int
+            Quantidade de avaliações incluídas.
+        """
+        reviews = reviews.drop_duplicates(subset= 'review_id', keep= 'first')
+        reviews = reviews.loc[~reviews['review_id'].astype(object).isin(self._rows.keys())]
+
+        if reviews.empty:
+            return 0
+
+        new_counts = self.__count_matrix(self.__review_texts(reviews), self.vocabulary)
+
+        # Termos novos acrescentam colunas à matriz existente
+        self.counts.resize((self.counts.shape[0], len(self.vocabulary)))
+        self.counts = sp.vstack([self.counts, new_counts], format= 'csr')
+
+        new_ids = reviews['review_id'].astype(object).to_numpy()
+        self._rows.update(zip(new_ids, range(self.review_ids.shape[0], self.review_ids.shape[0] + new_ids.shape[0])))
+        self.review_ids = np.concatenate([self.review_ids, new_ids])
+
+        self._tfidf = None
+        self._postings = None
+
+        return new_ids.shape[0]
+
+    def document_frequency(self) -> np.ndarray:
+        """
+        Quantidade de avaliações em que cada termo aparece.
+        """
+        return np.bincount(self.counts.indices, minlength= self.counts.shape[1])
+
+    def tfidf(self) -> sp.csr_matrix:
+        """
+        Matriz TF-IDF (avaliações x termos), com IDF suavizado e linhas normalizadas pela norma L2.
+        """
+        if self._tfidf is None:
+            n_reviews = self.counts.shape[0]
+            idf = np.log((1 + n_reviews) / (1 + self.document_frequency())) + 1
+
+            tfidf = self.counts.astype(np.float64) @ sp.diags(idf)
+            norms = np.sqrt(tfidf.multiply(tfidf).sum(axis= 1)).A1
+            norms[norms == 0] = 1
+
+            self._tfidf = sp.csr_matrix(sp.diags(1 / norms) @ tfidf)
+
+        return self._tfidf
+
+    def postings(self, term: str) -> np.ndarray:
+        """
+        Linhas das avaliações que contêm o termo (índice invertido).
+        """
+        if self._postings is None:
+            # Em formato CSC, as linhas não nulas de cada coluna formam a lista de ocorrências do termo
+            self._postings = self.counts.tocsc()
+            self._postings.sort_indices()
+
+        col = self.vocabulary.get(term)
+        if col is None:
+            return np.array([], dtype= np.int32)
+
+        return self._postings.indices[self._postings.indptr[col]:self._postings.indptr[col + 1]]
+
+    def rows_of(self, review_ids: Iterable) -> np.ndarray:
+        """
+        Linhas do índice das avaliações informadas (avaliações não indexadas são ignoradas).
+        """
+        rows = [self._rows.get(review_id) for review_id in review_ids]
+
+        return np.array(sorted(row for row in rows if row is not None), dtype= np.int32)
+
+    @profiled('review_text.search')
+    def search(self, query: str, review_ids: Iterable = None, match_all: bool = True) -> pd.DataFrame:
+        """
+        Busca as avaliações cujos comentários contêm os termos da consulta, ordenadas pela relevância (TF-IDF).
+
+        Parâmetros:
+        -----------
+        query : str
+            Termos buscados (normalizados como os comentários, ex.: 'atraso', 'não recebi').
+
+        review_ids : Iterable
+            Restringe a busca a essas avaliações (ex.: avaliações com nota 1). Se None, busca em todas.
+
+        match_all : bool
+            Se True, exige todos os termos da consulta. Se False, basta um deles.
+
+        Retorno:
+        --------
+        pd.DataFrame
+            DataFrame com as variáveis 'review_id' e 'score'.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        postings = [self.postings(term) for term in terms]
+
+        if not postings or (match_all and any(rows.shape[0] == 0 for rows in postings)):
+            return pd.DataFrame({'review_id': pd.Series(dtype= object), 'score': pd.Series(dtype= float)})
+
+        rows = postings[0]
+        for term_rows in postings[1:]:
+            rows = np.intersect1d(rows, term_rows, assume_unique= True) if match_all else np.union1d(rows, term_rows)
+
+        if review_ids is not None:
+            rows = np.intersect1d(rows, self.rows_of(review_ids), assume_unique= True)
+
+        cols = [self.vocabulary[term] for term in terms if term in self.vocabulary]
+        scores = self.tfidf()[rows][:, cols].sum(axis= 1).A1
+
+        result = pd.DataFrame({'review_id': self.review_ids[rows], 'score': scores})
+
+        return result.sort_values('score', ascending= False, kind= 'stable').reset_index(drop= True)
+
+    def term_frequencies(self, terms: List[str] = None) -> pd.DataFrame:
+        """
+        Frequência dos termos por avaliação em formato longo, pronta para ser unida às avaliações por 'review_id'.
+
+        Parâmetros:
+        -----------
+        terms : List[str]
+            Termos selecionados (normalizados com 'tokenize'). Se None, utiliza todos os termos.
+
+        Retorno:
+        --------
+        pd.DataFrame
+            DataFrame com as variáveis 'review_id', 'term' e 'count'.
+        """
+        counts = self.counts
+        term_names = self.terms
+        if terms is not None:
+            cols = [self.vocabulary[term] for token in terms for term in tokenize(token) if term in self.vocabulary]
+            counts = counts[:, cols]
+            term_names = term_names[cols]
+
+        counts = counts.tocoo()
+
+        return pd.DataFrame({'review_id': self.review_ids[counts.row], 'term': term_names[counts.col], 'count': counts.data})
+
+    def __phrase_presence(self, presence: sp.csr_matrix, phrases: List[str]) -> sp.csc_matrix:
+        # Uma coluna por expressão: 1 nas avaliações que contêm todos os termos da expressão
+        cols = []
+        for phrase in phrases:
+            tokens = list(dict.fromkeys(tokenize(phrase)))
+            if not tokens or any(token not in self.vocabulary for token in tokens):
+                cols.append(sp.csc_matrix((presence.shape[0], 1)))
+                continue
+
+            col = presence[:, self.vocabulary[tokens[0]]]
+            for token in tokens[1:]:
+                col = col.multiply(presence[:, self.vocabulary[token]])
+            cols.append(sp.csc_matrix(col))
+
+        return sp.hstack(cols, format= 'csc') if cols else sp.csc_matrix((presence.shape[0], 0))
+
+    @profiled('review_text.term_share_by')
+    def term_share_by(self, groups: pd.Series, terms: List[str] = None, top_n: int = 20) -> pd.DataFrame:
+        """
+        Proporção das avaliações de cada grupo que mencionam cada termo (ex.: por nota ou por faixa de
+        tempo de entrega), calculada com um produto de matrizes esparsas.
+
+        Parâmetros:
+        -----------
+        groups : pd.Series
+            Grupo de cada avaliação, indexado por 'review_id' (ex.: reviews.set_index('review_id')['review_score']).
+
+        terms : List[str]
+            Termos ou expressões exibidos (ex.: 'atraso', 'não recebi'). Uma expressão é contada nas avaliações
+            que contêm todos os seus termos, como em 'search'. Se None, utiliza os 'top_n' termos mais
+            frequentes nas avaliações agrupadas.
+
+        top_n : int
+            Quantidade de termos quando 'terms' é None.
+
+        Retorno:
+        --------
+        pd.DataFrame
+            DataFrame com uma linha por grupo, uma coluna por termo e a quantidade de avaliações ('n_reviews').
+        """
+        groups = groups[~groups.index.duplicated(keep= 'first')].dropna()
+        rows = np.array([self._rows.get(review_id, -1) for review_id in groups.index])
+        indexed = rows >= 0
+
+        codes, uniques = pd.factorize(groups.to_numpy()[indexed], sort= True)
+        indicator = sp.csr_matrix((np.ones(codes.shape[0]), (codes, rows[indexed])), shape= (len(uniques), self.counts.shape[0]))
+
+        # Avaliações de cada grupo que contêm cada termo
+        presence = (self.counts > 0).astype(np.float64)
+
+        if terms is None:
+            mentions = indicator @ presence
+            cols = np.argsort(-mentions.sum(axis= 0).A1, kind= 'stable')[:top_n]
+            mentions = mentions[:, cols]
+            labels = self.terms[cols]
+        else:
+            labels = list(dict.fromkeys(terms))
+            mentions = indicator @ self.__phrase_presence(presence, labels)
+
+        n_reviews = indicator.sum(axis= 1).A1
+        share = mentions.toarray() / np.maximum(n_reviews, 1)[:, None]
+
+        result = pd.DataFrame(share, index= pd.Index(uniques, name= groups.name), columns= labels)
+        result['n_reviews'] = n_reviews.astype(int)
+
+        return result
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Grava o índice no diretório informado: contagens e TF-IDF ('.npz'), identificadores das avaliações e termos.
+        """
+        path = Path(path)
+        path.mkdir(parents= True, exist_ok= True)
+
+        sp.save_npz(path / 'counts.npz', self.counts)
+        sp.save_npz(path / 'tfidf.npz', self.tfidf())
+        pd.DataFrame({'review_id': self.review_ids.astype(str)}).to_parquet(path / 'review_ids.parquet', index= False)
+
+        with open(path / 'terms.json', 'w', encoding= 'utf-8') as file:
+            json.dump(self.terms.tolist(), file, ensure_ascii= False)
+
+        return None
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'ReviewTextIndex':
+        """
+        Carrega um índice gravado por 'save'. Novas avaliações podem ser incluídas com 'update'.
+        """
+        path = Path(path)
+        index = cls()
+
+        index.counts = sp.load_npz(path / 'counts.npz').tocsr()
+        index._tfidf = sp.load_npz(path / 'tfidf.npz').tocsr()
+        index.review_ids = pd.read_parquet(path / 'review_ids.parquet')['review_id'].to_numpy(dtype= object)
+        index._rows = dict(zip(index.review_ids, range(index.review_ids.shape[0])))
+
+        with open(path / 'terms.json', encoding= 'utf-8') as file:
+            index.vocabulary = {term: col for col, term in enumerate(json.load(file))}
+
+        return index
@@ -0,0 +1,401 @@
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+# Tamanho das tabelas do dataset público da Olist (fator de escala 1)
+BASE_SIZES = {
+    'orders': 99441,
+    'products': 32951,
+    'sellers': 3095,
+    'zip_code_prefixes': 19015
+}
+
+# Participação de cada estado nos clientes (aprox. a distribuição do dataset público)
+STATES_WEIGHTS = {
+    'SP': 0.420, 'RJ': 0.129, 'MG': 0.117, 'RS': 0.055, 'PR': 0.051, 'SC': 0.037, 'BA': 0.034,
+    'DF': 0.021, 'ES': 0.020, 'GO': 0.020, 'PE': 0.017, 'CE': 0.013, 'PA': 0.010, 'MT': 0.009,
+    'MA': 0.0075, 'MS': 0.0072, 'PB': 0.0054, 'PI': 0.0050, 'RN': 0.0049, 'AL': 0.0041, 'SE': 0.0034,
+    'TO': 0.0028, 'RO': 0.0025, 'AM': 0.0015, 'AC': 0.0008, 'AP': 0.0007, 'RR': 0.0005
+}
+
+# Faixa de prefixos de CEP, capital e coordenadas aproximadas de cada estado
+STATES_INFO = {
+    'SP': (1000, 19999, 'sao paulo', -23.55, -46.63), 'RJ': (20000, 28999, 'rio de janeiro', -22.91, -43.17),
+    'ES': (29000, 29999, 'vitoria', -20.32, -40.34), 'MG': (30000, 39999, 'belo horizonte', -19.92, -43.94),
+    'BA': (40000, 48999, 'salvador', -12.97, -38.50), 'SE': (49000, 49999, 'aracaju', -10.91, -37.07),
+    'PE': (50000, 56999, 'recife', -8.05, -34.88), 'AL': (57000, 57999, 'maceio', -9.67, -35.74),
+    'PB': (58000, 58999, 'joao pessoa', -7.12, -34.86), 'RN': (59000, 59999, 'natal', -5.79, -35.21),
+    'CE': (60000, 63999, 'fortaleza', -3.73, -38.52), 'PI': (64000, 64999, 'teresina', -5.09, -42.80),
+    'MA': (65000, 65999, 'sao luis', -2.53, -44.30), 'PA': (66000, 68899, 'belem', -1.46, -48.49),
+    'AP': (68900, 68999, 'macapa', 0.03, -51.07), 'AM': (69000, 69299, 'manaus', -3.12, -60.02),
+    'RR': (69300, 69399, 'boa vista', 2.82, -60.67), 'AC': (69900, 69999, 'rio branco', -9.97, -67.81),
+    'DF': (70000, 72799, 'brasilia', -15.79, -47.88), 'GO': (72800, 76799, 'goiania', -16.68, -49.25),
+    'RO': (76800, 76999, 'porto velho', -8.76, -63.90), 'TO': (77000, 77999, 'palmas', -10.18, -48.33),
+    'MT': (78000, 78899, 'cuiaba', -15.60, -56.10), 'MS': (79000, 79999, 'campo grande', -20.44, -54.65),
+    'PR': (80000, 87999, 'curitiba', -25.43, -49.27), 'SC': (88000, 89999, 'florianopolis', -27.60, -48.55),
+    'RS': (90000, 99999, 'porto alegre', -30.03, -51.23)
+}
+
+CATEGORIES_TRANSLATION = {
+    'cama_mesa_banho': 'bed_bath_table', 'beleza_saude': 'health_beauty', 'esporte_lazer': 'sports_leisure',
+    'moveis_decoracao': 'furniture_decor', 'informatica_acessorios': 'computers_accessories',
+    'utilidades_domesticas': 'housewares', 'relogios_presentes': 'watches_gifts', 'telefonia': 'telephony',
+    'ferramentas_jardim': 'garden_tools', 'automotivo': 'auto', 'brinquedos': 'toys', 'cool_stuff': 'cool_stuff',
+    'perfumaria': 'perfumery', 'bebes': 'baby', 'eletronicos': 'electronics', 'papelaria': 'stationery',
+    'fashion_bolsas_e_acessorios': 'fashion_bags_accessories', 'pet_shop': 'pet_shop',
+    'moveis_escritorio': 'office_furniture', 'consoles_games': 'consoles_games', 'malas_acessorios': 'luggage_accessories',
+    'construcao_ferramentas_construcao': 'construction_tools_construction', 'eletrodomesticos': 'home_appliances',
+    'instrumentos_musicais': 'musical_instruments', 'eletroportateis': 'small_appliances', 'casa_construcao': 'home_construction',
+    'livros_interesse_geral': 'books_general_interest', 'alimentos': 'food', 'moveis_sala': 'furniture_living_room',
+    'casa_conforto': 'home_confort', 'bebidas': 'drinks', 'audio': 'audio', 'market_place': 'market_place',
+    'climatizacao': 'air_conditioning', 'livros_tecnicos': 'books_technical', 'fashion_calcados': 'fashion_shoes',
+    'pcs': 'computers', 'artes': 'art', 'artigos_de_natal': 'christmas_supplies', 'fashion_roupa_masculina': 'fashion_male_clothing'
+}
+
+ORDER_STATUS_WEIGHTS = {
+    'delivered': 0.9702, 'shipped': 0.0111, 'canceled': 0.0063, 'unavailable': 0.0061,
+    'invoiced': 0.0032, 'processing': 0.0030, 'created': 0.0001, 'approved': 0.00002
+}
+
+PAYMENT_TYPES_WEIGHTS = {'credit_card': 0.7392, 'boleto': 0.1904, 'voucher': 0.0556, 'debit_card': 0.0148}
+
+# Distribuição das notas de avaliação para pedidos entregues no prazo e com atraso
+REVIEW_SCORES_WEIGHTS = {
+    'on_time': [0.07, 0.025, 0.08, 0.20, 0.625],
+    'delayed': [0.46, 0.09, 0.12, 0.13, 0.20]
+}
+
+REVIEW_COMMENTS = {
+    1: ['Ainda não recebi o produto', 'Produto com defeito, péssimo', 'Atraso na entrega e ninguém responde',
+        'Não recomendo esta loja', 'Veio errado, quero meu dinheiro de volta'],
+    2: ['Produto de qualidade ruim', 'Entrega com atraso', 'Veio faltando uma peça'],
+    3: ['Produto ok', 'Poderia ser melhor', 'Entrega demorou um pouco mas chegou'],
+    4: ['Bom produto', 'Chegou no prazo', 'Gostei, recomendo'],
+    5: ['Ótimo produto, recomendo', 'Chegou antes do prazo', 'Excelente qualidade, muito satisfeito',
+        'Tudo certo, entrega rápida', 'Perfeito, amei']
+}
+
+REVIEW_TITLES = {
+    1: ['Péssimo', 'Não recebi', 'Atraso'], 2: ['Ruim', 'Demorou'], 3: ['Regular', 'Ok'],
+    4: ['Bom', 'Recomendo'], 5: ['Ótimo', 'Excelente', 'Super recomendo']
+}
+
+
+def __generate_ids(rng: np.random.Generator, n: int) -> np.ndarray:
+    # Identificadores hexadecimais de 32 caracteres, como os do dataset público
+    hex_ids = rng.bytes(16 * n).hex()
+
+    return np.array([hex_ids[i:i + 32] for i in range(0, 32 * n, 32)], dtype= object)
+
+
+def __zipf_weights(n: int, exponent: float) -> np.ndarray:
+    weights = 1 / np.arange(1, n + 1) ** exponent
+
+    return weights / weights.sum()
+
+
+def __pick(rng: np.random.Generator, options: Dict, n: int) -> np.ndarray:
+    values = np.array(list(options.keys()), dtype= object)
+    weights = np.array(list(options.values()), dtype= float)
+
+    return rng.choice(values, size= n, p= weights / weights.sum())
+
+
+def __pick_text(rng: np.random.Generator, options: Dict, scores: np.ndarray, probability: float) -> np.ndarray:
+    texts = np.full(scores.shape[0], np.nan, dtype= object)
+    has_text = rng.random(scores.shape[0]) < probability
+
+    for score, phrases in options.items():
+        mask = has_text & (scores == score)
+        texts[mask] = rng.choice(np.array(phrases, dtype= object), size= mask.sum())
+
+    return texts
+
+
+def __generate_geolocation(rng: np.random.Generator, scale_factor: float) -> pd.DataFrame:
+    states = np.array(list(STATES_WEIGHTS.keys()), dtype= object)
+    weights = np.array(list(STATES_WEIGHTS.values()))
+    weights = weights / weights.sum()
+
+    # Os prefixos de cada estado são limitados pela sua faixa de CEP
+    capacity = np.array([STATES_INFO[state][1] - STATES_INFO[state][0] + 1 for state in states])
+    n_prefixes = np.minimum(np.maximum(np.round(weights * BASE_SIZES['zip_code_prefixes'] * scale_factor), 1), capacity).astype(int)
+
+    frames = []
+    for state, n in zip(states, n_prefixes):
+        start, end, city, lat, lng = STATES_INFO[state]
+        prefixes = rng.choice(np.arange(start, end + 1), size= n, replace= False)
+
+        # Cada prefixo aparece em mais de um registro (duplicados removidos na preparação dos dados)
+        repeats = 1 + rng.poisson(2, size= n)
+        prefixes = np.repeat(prefixes, repeats)
+        n_rows = prefixes.shape[0]
+
+        frames.append(pd.DataFrame({
+            'geolocation_zip_code_prefix': prefixes,
+            'geolocation_lat': lat + rng.normal(0, 1.0, n_rows),
+            'geolocation_lng': lng + rng.normal(0, 1.0, n_rows),
+            'geolocation_city': city,
+            'geolocation_state': state
+        }))
+
+    geolocation = pd.concat(frames, ignore_index= True)
+
+    return geolocation.sample(frac= 1, random_state= rng.integers(2**31)).reset_index(drop= True)
+
+
+def __pick_locations(rng: np.random.Generator, geolocation: pd.DataFrame, states: np.ndarray) -> pd.DataFrame:
+    prefixes = geolocation.drop_duplicates('geolocation_zip_code_prefix')
+
+    zip_codes = np.empty(states.shape[0], dtype= np.int64)
+    cities = np.empty(states.shape[0], dtype= object)
+    for state, group in prefixes.groupby('geolocation_state'):
+        mask = states == state
+        if not mask.any():
+            continue
+
+        # Poucos prefixos concentram a maior parte dos endereços de cada estado
+        index = rng.choice(group.shape[0], size= mask.sum(), p= __zipf_weights(group.shape[0], 0.8))
+        zip_codes[mask] = group['geolocation_zip_code_prefix'].to_numpy()[index]
+        cities[mask] = group['geolocation_city'].to_numpy()[index]
+
+    return pd.DataFrame({'zip_code_prefix': zip_codes, 'city': cities, 'state': states})
+
+
+def __generate_products(rng: np.random.Generator, n_products: int) -> pd.DataFrame:
+    categories = np.array(list(CATEGORIES_TRANSLATION.keys()), dtype= object)
+    category = categories[rng.choice(categories.shape[0], size= n_products, p= __zipf_weights(categories.shape[0], 1.0))]
+
+    products = pd.DataFrame({
+        'product_id': __generate_ids(rng, n_products),
+        'product_category_name': category,
+        'product_name_lenght': rng.integers(5, 77, n_products).astype(float),
+        'product_description_lenght': np.clip(rng.lognormal(6.4, 0.8, n_products), 4, 3992).round(),
+        'product_photos_qty': np.clip(rng.geometric(0.5, n_products), 1, 20).astype(float),
+        'product_weight_g': np.clip(rng.lognormal(6.6, 1.2, n_products), 2, 40425).round(),
+        'product_length_cm': np.clip(rng.lognormal(3.3, 0.5, n_products), 7, 105).round(),
+        'product_height_cm': np.clip(rng.lognormal(2.6, 0.7, n_products), 2, 105).round(),
+        'product_width_cm': np.clip(rng.lognormal(3.1, 0.5, n_products), 6, 118).round()
+    })
+
+    # Valores faltantes e zerados presentes no dataset público
+    na_identification = rng.random(n_products) < 0.0185
+    products.loc[na_identification, ['product_category_name', 'product_name_lenght',
+                                     'product_description_lenght', 'product_photos_qty']] = np.nan
+    products.loc[rng.random(n_products) < 0.0001, 'product_weight_g'] = 0
+
+    return products
+
+
+def __generate_order_dates(rng: np.random.Generator, n_orders: int, status: np.ndarray) -> pd.DataFrame:
+    start = pd.Timestamp('2016-09-04').value
+    end = pd.Timestamp('2018-10-17').value
+
+    # Volume de pedidos crescente ao longo do período
+    purchase = pd.to_datetime(start + np.sqrt(rng.random(n_orders)) * (end - start))
+    black_friday = rng.random(n_orders) < 0.015
+    purchase = purchase.where(~black_friday, pd.Timestamp('2017-11-24') + pd.to_timedelta(rng.random(n_orders) * 86400, unit= 's'))
+
+    approved = purchase + pd.to_timedelta(rng.exponential(10, n_orders), unit= 'h')
+    carrier = approved + pd.to_timedelta(rng.gamma(2, 1.5, n_orders), unit= 'D')
+    delivered = carrier + pd.to_timedelta(rng.gamma(2.2, 4.2, n_orders), unit= 'D')
+    estimated = (purchase + pd.to_timedelta(rng.normal(24, 6, n_orders).clip(3), unit= 'D')).floor('D')
+
+    dates = pd.DataFrame({
+        'order_purchase_timestamp': purchase.floor('s'),
+        'order_approved_at': approved.floor('s'),
+        'order_delivered_carrier_date': carrier.floor('s'),
+        'order_delivered_customer_date': delivered.floor('s'),
+        'order_estimated_delivery_date': estimated
+    })
+
+    # Datas inexistentes de acordo com o status do pedido
+    not_shipped = np.isin(status, ['canceled', 'unavailable', 'invoiced', 'processing', 'created'])
+    dates.loc[not_shipped | (status == 'shipped'), 'order_delivered_customer_date'] = pd.NaT
+    dates.loc[not_shipped, 'order_delivered_carrier_date'] = pd.NaT
+    dates.loc[status == 'created', 'order_approved_at'] = pd.NaT
+
+    # Anomalias de pedidos 'delivered' tratadas na preparação dos dados
+    delivered_mask = status == 'delivered'
+    anomalies = rng.random(n_orders)
+    dates.loc[delivered_mask & (anomalies < 0.00015), 'order_approved_at'] = pd.NaT
+    dates.loc[delivered_mask & (anomalies >= 0.00015) & (anomalies < 0.00035), 'order_delivered_carrier_date'] = pd.NaT
+    dates.loc[delivered_mask & (anomalies >= 0.00035) & (anomalies < 0.00045), 'order_delivered_customer_date'] = pd.NaT
+    dates.loc[delivered_mask & (anomalies >= 0.00045) & (anomalies < 0.0005),
+              ['order_delivered_carrier_date', 'order_delivered_customer_date']] = pd.NaT
+
+    return dates
+
+
+def generate_olist_dataframes(scale_factor: float = 1.0, seed: int = 33) -> Dict[str, pd.DataFrame]:
+    """
+    Gera versões sintéticas e referencialmente consistentes das tabelas da Olist.
+
+    As tabelas seguem as colunas do dataset público e reproduzem as suas principais assimetrias:
+    concentração de clientes e vendedores em SP, popularidade de categorias e produtos (Zipf), poucos
+    clientes recorrentes, pedidos majoritariamente com um item, notas de avaliação piores para pedidos
+    atrasados e os valores faltantes, duplicados e zerados tratados na preparação dos dados.
+
+    Parâmetros:
+    -----------
+    scale_factor : float
+        Fator de escala em relação ao dataset público (1 = ~100 mil pedidos).
+
+    seed : int
+        Semente do gerador de números aleatórios.
+
+    Retorno:
+    --------
+    Dict[str, pd.DataFrame]
+        Dicionário com os dataframes, com as mesmas chaves utilizadas na preparação dos dados.
+    """
+    rng = np.random.default_rng(seed)
+
+    n_orders = max(int(round(BASE_SIZES['orders'] * scale_factor)), 10)
+    n_products = max(int(round(BASE_SIZES['products'] * scale_factor)), 10)
+    n_sellers = max(int(round(BASE_SIZES['sellers'] * scale_factor)), 10)
+
+    geolocation = __generate_geolocation(rng, scale_factor)
+
+    # --- Vendedores: mais concentrados em SP do que os clientes
+    states = np.array(list(STATES_WEIGHTS.keys()), dtype= object)
+    states_weights = np.array(list(STATES_WEIGHTS.values()))
+    sellers_weights = states_weights ** 2 / (states_weights ** 2).sum()
+
+    sellers_locations = __pick_locations(rng, geolocation, rng.choice(states, size= n_sellers, p= sellers_weights))
+    sellers = pd.DataFrame({
+        'seller_id': __generate_ids(rng, n_sellers),
+        'seller_zip_code_prefix': sellers_locations['zip_code_prefix'],
+        'seller_city': sellers_locations['city'],
+        'seller_state': sellers_locations['state']
+    })
+
+    # --- Produtos: cada produto pertence a um vendedor, com poucos vendedores concentrando o catálogo
+    products = __generate_products(rng, n_products)
+    products_seller = rng.choice(n_sellers, size= n_products, p= __zipf_weights(n_sellers, 0.9))
+
+    # --- Clientes: um 'customer_id' por pedido e poucos 'customer_unique_id' recorrentes
+    n_unique_customers = int(round(n_orders * 0.966))
+    unique_ids = __generate_ids(rng, n_unique_customers)
+    repeated = rng.choice(n_unique_customers, size= n_orders - n_unique_customers, p= __zipf_weights(n_unique_customers, 0.5))
+    customers_unique_index = rng.permutation(np.concatenate([np.arange(n_unique_customers), repeated]))
+
+    unique_states = rng.choice(states, size= n_unique_customers, p= states_weights / states_weights.sum())
+    unique_locations = __pick_locations(rng, geolocation, unique_states)
+
+    customers = pd.DataFrame({
+        'customer_id': __generate_ids(rng, n_orders),
+        'customer_unique_id': unique_ids[customers_unique_index],
+        'customer_zip_code_prefix': unique_locations['zip_code_prefix'].to_numpy()[customers_unique_index],
+        'customer_city': unique_locations['city'].to_numpy()[customers_unique_index],
+        'customer_state': unique_locations['state'].to_numpy()[customers_unique_index]
+    })
+
+    # --- Pedidos
+    status = __pick(rng, ORDER_STATUS_WEIGHTS, n_orders)
+    orders = pd.concat([
+        pd.DataFrame({'order_id': __generate_ids(rng, n_orders), 'customer_id': customers['customer_id'], 'order_status': status}),
+        __generate_order_dates(rng, n_orders, status)
+    ], axis= 1)
+
+    # --- Itens: maioria dos pedidos com um item; 'created' sem itens
+    has_items = status != 'created'
+    n_items = np.where(has_items, np.minimum(rng.geometric(0.9, n_orders), 21), 0)
+    items_order = np.repeat(np.arange(n_orders), n_items)
+    items_product = rng.choice(n_products, size= items_order.shape[0], p= __zipf_weights(n_products, 0.7))
+
+    # Itens do mesmo pedido recebem numeração sequencial
+    first_item = np.repeat(np.cumsum(n_items) - n_items, n_items)
+    order_item_id = np.arange(items_order.shape[0]) - first_item + 1
+
+    price = np.round(rng.lognormal(4.3, 0.9, items_order.shape[0]).clip(0.85, 6735), 2)
+    weight_kg = products['product_weight_g'].to_numpy()[items_product] / 1000
+    freight_value = np.round((8 + 2.5 * np.nan_to_num(weight_kg) + rng.gamma(2, 4, items_order.shape[0])).clip(0, 409), 2)
+
+    order_items = pd.DataFrame({
+        'order_id': orders['order_id'].to_numpy()[items_order],
+        'order_item_id': order_item_id,
+        'product_id': products['product_id'].to_numpy()[items_product],
+        'seller_id': sellers['seller_id'].to_numpy()[products_seller[items_product]],
+        'shipping_limit_date': (orders['order_approved_at'].fillna(orders['order_purchase_timestamp']).to_numpy()[items_order]
+                                + pd.to_timedelta(6, unit= 'D')),
+        'price': price,
+        'freight_value': freight_value
+    })
+
+    # --- Pagamentos: valor total do pedido dividido entre um ou mais pagamentos
+    order_total = np.bincount(items_order, weights= price + freight_value, minlength= n_orders)
+    order_total = np.where(has_items, order_total, np.round(rng.lognormal(4.5, 0.8, n_orders), 2))
+
+    n_payments = np.where(rng.random(n_orders) < 0.03, 1 + rng.geometric(0.5, n_orders), 1)
+    payments_order = np.repeat(np.arange(n_orders), n_payments)
+    first_payment = np.repeat(np.cumsum(n_payments) - n_payments, n_payments)
+    payment_sequential = np.arange(payments_order.shape[0]) - first_payment + 1
+
+    payment_type = __pick(rng, PAYMENT_TYPES_WEIGHTS, payments_order.shape[0])
+    payment_type[payment_sequential > 1] = 'voucher'
+
+    payment_installments = np.where(payment_type == 'credit_card', np.minimum(rng.geometric(0.35, payments_order.shape[0]), 24), 1)
+    payment_installments[rng.random(payments_order.shape[0]) < 0.00002] = 0
+
+    order_payments = pd.DataFrame({
+        'order_id': orders['order_id'].to_numpy()[payments_order],
+        'payment_sequential': payment_sequential,
+        'payment_type': payment_type,
+        'payment_installments': payment_installments,
+        'payment_value': np.round(order_total[payments_order] / n_payments[payments_order], 2)
+    })
+
+    # --- Avaliações: notas piores para pedidos atrasados ou não entregues
+    reviewed = rng.random(n_orders) < 0.9978
+    reviews_order = np.flatnonzero(reviewed)
+
+    delivered_date = orders['order_delivered_customer_date'].to_numpy()[reviews_order]
+    delayed = (pd.isna(delivered_date) |
+               (delivered_date > orders['order_estimated_delivery_date'].to_numpy()[reviews_order]))
+
+    review_score = np.where(
+        delayed,
+        rng.choice(np.arange(1, 6), size= reviews_order.shape[0], p= REVIEW_SCORES_WEIGHTS['delayed']),
+        rng.choice(np.arange(1, 6), size= reviews_order.shape[0], p= REVIEW_SCORES_WEIGHTS['on_time'])
+    )
+
+    review_creation_date = pd.Series(delivered_date).fillna(
+        pd.Series(orders['order_estimated_delivery_date'].to_numpy()[reviews_order])
+    ).dt.floor('D') + pd.to_timedelta(1, unit= 'D')
+
+    order_reviews = pd.DataFrame({
+        'review_id': __generate_ids(rng, reviews_order.shape[0]),
+        'order_id': orders['order_id'].to_numpy()[reviews_order],
+        'review_score': review_score,
+        'review_comment_title': __pick_text(rng, REVIEW_TITLES, review_score, 0.117),
+        'review_comment_message': __pick_text(rng, REVIEW_COMMENTS, review_score, 0.413),
+        'review_creation_date': review_creation_date,
+        'review_answer_timestamp': (review_creation_date + pd.to_timedelta(rng.exponential(3, reviews_order.shape[0]), unit= 'D')).dt.floor('s')
+    })
+
+    # Avaliações replicadas para outro pedido do mesmo cliente (duplicados removidos na preparação dos dados)
+    reviews_unique_id = customers['customer_unique_id'].to_numpy()[reviews_order]
+    order_by_customer = np.argsort(reviews_unique_id, kind= 'stable')
+    same_customer = reviews_unique_id[order_by_customer][1:] == reviews_unique_id[order_by_customer][:-1]
+    selected = same_customer & (rng.random(same_customer.shape[0]) < 0.25)
+
+    for col in [col for col in order_reviews.columns if col != 'order_id']:
+        values = order_reviews[col].to_numpy().copy()
+        values[order_by_customer[1:][selected]] = values[order_by_customer[:-1][selected]]
+        order_reviews[col] = values
+
+    return {
+        'customers': customers,
+        'geolocation': geolocation,
+        'order_items': order_items,
+        'order_payments': order_payments,
+        'order_reviews': order_reviews,
+        'orders': orders,
+        'products': products,
+        'sellers': sellers,
+        'product_category_name_translation': pd.DataFrame({
+            'product_category_name': list(CATEGORIES_TRANSLATION.keys()),
+            'product_category_name_english': list(CATEGORIES_TRANSLATION.values())
+        })
+    }